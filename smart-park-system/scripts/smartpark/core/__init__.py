@@ -6,7 +6,7 @@ e funcionalidades centrais.
 """
 
 from .config import Config, SmartParkConfig, config
-from .detector import SmartParkDetector, DetectionMode
+from .detector import SmartParkDetector, DetectionMode, StatusChange
 from .threshold_detector import ThresholdDetector
 from .api_client import SmartParkAPIClient
 
@@ -25,6 +25,7 @@ __all__ = [
     "config", 
     "SmartParkDetector",
     "DetectionMode",
+    "StatusChange",
     "ThresholdDetector",
     "SmartParkAPIClient",
     "YOLO_AVAILABLE"
@@ -29,6 +29,9 @@ class Config:
         self.config_path = Path(config_path)
         self.data = {}
 
+        # Cache das zonas convertidas (invalidado quando a configuração muda)
+        self._parking_zones = None
+
         # Configurações padrão
         self._load_defaults()
 
@@ -88,6 +91,7 @@ class Config:
 
             # Mergear com configurações padrão
             self._merge_configs(self.data, file_data)
+            self._parking_zones = None
 
         except Exception as e:
             print(f"Erro ao carregar configuração de {self.config_path}: {e}")
@@ -141,6 +145,9 @@ class Config:
 
         target[keys[-1]] = value
 
+        if keys[0] == "zones":
+            self._parking_zones = None
+
     def save(self):
         """Salva configurações atual no arquivo"""
         try:
@@ -186,7 +193,16 @@ class Config:
     
     @property
     def parking_zones(self):
-        """Acesso às zonas de estacionamento convertidas para objetos ParkingZone"""
+        """
+        Acesso às zonas de estacionamento convertidas para objetos ParkingZone
+
+        A lista é construída uma vez e reutilizada (mesma identidade) até que
+        as zonas sejam alteradas via set() ou recarregadas do arquivo, o que
+        permite aos detectores manter dados pré-calculados por zona.
+        """
+        if self._parking_zones is not None:
+            return self._parking_zones
+
         from utils.image_utils import ParkingZone
         
         zones_config = self.zones
@@ -197,6 +213,7 @@ class Config:
                 parking_zone = ParkingZone.from_config_zone(zone_config)
                 parking_zones.append(parking_zone)
         
+        self._parking_zones = parking_zones
         return parking_zones
     
     def validate_config(self) -> List[str]:
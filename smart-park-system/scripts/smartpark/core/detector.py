@@ -6,8 +6,8 @@ modos de detecção de estacionamento: Threshold, YOLO e Hybrid.
 """
 
 import time
-from typing import Dict, List, Any, Optional, Callable
-from dataclasses import asdict
+from typing import Dict, List, Any, Optional, Callable, Iterable, Sequence
+from dataclasses import asdict, dataclass, replace
 from enum import Enum
 
 from utils.logger import LoggerMixin
@@ -37,6 +37,29 @@ class DetectionMode(Enum):
     HYBRID = "hybrid"
 
 
+@dataclass(slots=True, frozen=True)
+class StatusChange:
+    """Mudança de status de uma vaga entre dois frames"""
+
+    zone_code: str
+    previous_status: str
+    current_status: str
+    confidence: float
+    timestamp: float
+    zone_id: Optional[int]
+
+    def __getitem__(self, key: str) -> Any:
+        """Acesso por chave, compatível com o antigo formato em dicionário"""
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Converte para dicionário"""
+        return asdict(self)
+
+
 class SmartParkDetector(LoggerMixin):
     """
     Detector principal que unifica todos os modos de detecção.
@@ -52,6 +75,7 @@ class SmartParkDetector(LoggerMixin):
         mode: DetectionMode = DetectionMode.THRESHOLD,
         enable_api: bool = True,
         enable_performance_tracking: bool = True,
+        enabled_modes: Optional[Iterable[DetectionMode]] = None,
     ):
         """
         Inicializa o detector principal
@@ -61,6 +85,8 @@ class SmartParkDetector(LoggerMixin):
             mode: Modo de detecção inicial
             enable_api: Habilitar integração com API
             enable_performance_tracking: Habilitar rastreamento de performance
+            enabled_modes: Modos inicializados imediatamente (None = todos); os
+                demais são criados sob demanda em switch_mode/ensure_mode
         """
         super().__init__()
 
@@ -77,9 +103,14 @@ class SmartParkDetector(LoggerMixin):
         # Validar configuração para o modo escolhido
         self._validate_mode_config(mode)
 
+        # Escala dos frames recebidos em relação às coordenadas das zonas
+        self.detection_scale: float = 1.0
+        self._scaled_zones_source: Optional[List[ParkingZone]] = None
+        self._scaled_zones: List[ParkingZone] = []
+
         # Inicializar detectores
         self.detectors: Dict[DetectionMode, Any] = {}
-        self._initialize_detectors()
+        self._initialize_detectors(enabled_modes)
 
         # Configurar integração com API
         self.api_client: Optional[SmartParkAPIClient] = None
@@ -100,7 +131,7 @@ class SmartParkDetector(LoggerMixin):
         self.start_time: float = time.time()
 
         # Callbacks para eventos
-        self.status_change_callbacks: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self.status_change_callbacks: List[Callable[[Sequence[StatusChange]], None]] = []
 
         self.logger.info(f"SmartParkDetector inicializado em modo: {mode.value}")
 
@@ -118,33 +149,70 @@ class SmartParkDetector(LoggerMixin):
             self.logger.error(error_msg)
             raise ValueError(error_msg)
 
-    def _initialize_detectors(self):
-        """Inicializa os detectores disponíveis"""
-        # Detector Threshold sempre disponível
+    def _initialize_detectors(
+        self, enabled_modes: Optional[Iterable[DetectionMode]] = None
+    ):
+        """
+        Inicializa os detectores
+
+        Args:
+            enabled_modes: Modos a inicializar (None = todos os disponíveis)
+        """
+        if enabled_modes is None:
+            enabled_modes = list(DetectionMode)
+
+        for mode in DetectionMode:
+            if mode in enabled_modes:
+                self._create_detector(mode)
+
+    def _create_detector(self, mode: DetectionMode) -> bool:
+        """
+        Cria o detector de um modo
+
+        Args:
+            mode: Modo de detecção
+
+        Returns:
+            True se o detector foi criado
+        """
+        # Detectores YOLO (se disponível); Threshold sempre disponível
+        if mode != DetectionMode.THRESHOLD and not YOLO_AVAILABLE:
+            return False
+
+        factories = {
+            DetectionMode.THRESHOLD: ("threshold", ThresholdDetector, "Threshold"),
+            DetectionMode.YOLO: ("yolo", YOLODetector, "YOLO"),
+            DetectionMode.HYBRID: ("hybrid", HybridDetector, "Hybrid"),
+        }
+        config_key, detector_class, label = factories[mode]
+
         try:
-            threshold_config = self.config.get_config_for_mode("threshold")
-            self.detectors[DetectionMode.THRESHOLD] = ThresholdDetector(
-                threshold_config
-            )
-            self.logger.info("Detector Threshold inicializado")
+            mode_config = self.config.get_config_for_mode(config_key)
+            detector = detector_class(mode_config)
+            self._apply_detection_scale(detector)
+            self.detectors[mode] = detector
+            self.logger.info(f"Detector {label} inicializado")
+            return True
         except Exception as e:
-            self.logger.error(f"Erro ao inicializar Threshold detector: {e}")
+            self.logger.error(f"Erro ao inicializar {label} detector: {e}")
+            return False
 
-        # Detectores YOLO (se disponível)
-        if YOLO_AVAILABLE:
-            try:
-                yolo_config = self.config.get_config_for_mode("yolo")
-                self.detectors[DetectionMode.YOLO] = YOLODetector(yolo_config)
-                self.logger.info("Detector YOLO inicializado")
-            except Exception as e:
-                self.logger.error(f"Erro ao inicializar YOLO detector: {e}")
+    def ensure_mode(self, mode: DetectionMode) -> bool:
+        """
+        Garante que o detector de um modo esteja inicializado
 
-            try:
-                hybrid_config = self.config.get_config_for_mode("hybrid")
-                self.detectors[DetectionMode.HYBRID] = HybridDetector(hybrid_config)
-                self.logger.info("Detector Hybrid inicializado")
-            except Exception as e:
-                self.logger.error(f"Erro ao inicializar Hybrid detector: {e}")
+        Modelos pesados (YOLO) só são carregados na primeira vez que o modo
+        é solicitado.
+
+        Args:
+            mode: Modo de detecção
+
+        Returns:
+            True se o detector está disponível
+        """
+        if mode in self.detectors:
+            return True
+        return self._create_detector(mode)
 
     def _setup_api_client(self):
         """Configura cliente da API"""
@@ -176,6 +244,50 @@ class SmartParkDetector(LoggerMixin):
             self.logger.error(f"Erro ao configurar API client: {e}")
             self.enable_api = False
 
+    def set_detection_scale(self, scale: float):
+        """
+        Define a escala dos frames entregues ao detector
+
+        As zonas configuradas (na resolução original) são convertidas uma
+        única vez para a resolução de detecção.
+
+        Args:
+            scale: Fator aplicado à resolução original (1.0 = sem redução)
+        """
+        self.detection_scale = scale
+        self._scaled_zones_source = None
+        for detector in self.detectors.values():
+            self._apply_detection_scale(detector)
+
+    def _apply_detection_scale(self, detector: Any):
+        """Repassa a escala a detectores com parâmetros em pixels (threshold)"""
+        set_scale = getattr(detector, "set_detection_scale", None)
+        if set_scale is not None:
+            set_scale(self.detection_scale)
+
+    @property
+    def parking_zones(self) -> List[ParkingZone]:
+        """Zonas de estacionamento na resolução dos frames de detecção"""
+        zones = self.config.parking_zones
+        if self.detection_scale == 1.0:
+            return zones
+
+        if zones is not self._scaled_zones_source:
+            scale = self.detection_scale
+            self._scaled_zones = [
+                replace(
+                    zone,
+                    x=round(zone.x * scale),
+                    y=round(zone.y * scale),
+                    width=round(zone.width * scale),
+                    height=round(zone.height * scale),
+                )
+                for zone in zones
+            ]
+            self._scaled_zones_source = zones
+
+        return self._scaled_zones
+
     def process_frame(
         self, frame: Any, send_to_api: bool = True
     ) -> Dict[str, Dict[str, Any]]:
@@ -199,7 +311,7 @@ class SmartParkDetector(LoggerMixin):
             detector = self.detectors[self.current_mode]
 
             # Processar frame
-            results = detector.process_frame(frame, self.config.parking_zones)
+            results = detector.process_frame(frame, self.parking_zones)
 
             # Atualizar estado interno
             self.last_frame = frame
@@ -238,38 +350,41 @@ class SmartParkDetector(LoggerMixin):
 
     def _detect_status_changes(
         self, current_results: Dict[str, Dict[str, Any]]
-    ) -> List[Dict[str, Any]]:
+    ) -> List[StatusChange]:
         """Detecta mudanças de status em relação ao frame anterior"""
-        if not hasattr(self, "_previous_results"):
-            self._previous_results: Dict[str, Dict[str, Any]] = {}
+        if not hasattr(self, "_previous_statuses"):
+            self._previous_statuses: Dict[str, str] = {}
 
-        changes: List[Dict[str, Any]] = []
+        changes: List[StatusChange] = []
 
         for zone_code, current_result in current_results.items():
             current_status = current_result.get("status", "UNKNOWN")
 
-            if zone_code in self._previous_results:
-                previous_status = self._previous_results[zone_code].get(
-                    "status", "UNKNOWN"
-                )
+            if zone_code in self._previous_statuses:
+                previous_status = self._previous_statuses[zone_code]
 
                 if current_status != previous_status and current_status != "UNKNOWN":
                     changes.append(
-                        {
-                            "zone_code": zone_code,
-                            "previous_status": previous_status,
-                            "current_status": current_status,
-                            "confidence": current_result.get("confidence", 0.0),
-                            "timestamp": time.time(),
-                            "zone_id": current_result.get("zone_id"),
-                        }
+                        StatusChange(
+                            zone_code=zone_code,
+                            previous_status=previous_status,
+                            current_status=current_status,
+                            confidence=current_result.get("confidence", 0.0),
+                            timestamp=time.time(),
+                            zone_id=current_result.get("zone_id"),
+                        )
                     )
 
-        self._previous_results = current_results.copy()
+        # Guardar apenas os status: os detectores podem reutilizar os
+        # dicionários de resultado entre frames
+        self._previous_statuses = {
+            zone_code: result.get("status", "UNKNOWN")
+            for zone_code, result in current_results.items()
+        }
         return changes
 
     def _send_to_api(
-        self, results: Dict[str, Dict[str, Any]], status_changes: List[Dict[str, Any]]
+        self, results: Dict[str, Dict[str, Any]], status_changes: List[StatusChange]
     ):
         """Envia resultados para API"""
         try:
@@ -277,13 +392,13 @@ class SmartParkDetector(LoggerMixin):
             if status_changes:
                 responses = []
                 for change in status_changes:
-                    zone_code = change["zone_code"]
+                    zone_code = change.zone_code
                     if zone_code in self.zone_mapping:
                         slot_id = self.zone_mapping[zone_code]
                         response = self.api_client.send_slot_status_event(
                             slot_id=slot_id,
-                            status=change["current_status"],
-                            confidence=change["confidence"],
+                            status=change.current_status,
+                            confidence=change.confidence,
                             immediate=True,  # Forçar envio imediato
                         )
                         responses.append(response)
@@ -291,7 +406,7 @@ class SmartParkDetector(LoggerMixin):
                         # Log da resposta
                         if response.success:
                             self.logger.debug(
-                                f"Status enviado para slot {slot_id}: {change['current_status']}"
+                                f"Status enviado para slot {slot_id}: {change.current_status}"
                             )
                         else:
                             self.logger.warning(
@@ -301,7 +416,7 @@ class SmartParkDetector(LoggerMixin):
         except Exception as e:
             self.logger.error(f"Erro ao enviar dados para API: {e}")
 
-    def _notify_status_changes(self, status_changes: List[Dict[str, Any]]):
+    def _notify_status_changes(self, status_changes: Sequence[StatusChange]):
         """Notifica callbacks sobre mudanças de status"""
         for callback in self.status_change_callbacks:
             try:
@@ -336,7 +451,7 @@ class SmartParkDetector(LoggerMixin):
             # Validar novo modo
             self._validate_mode_config(new_mode)
 
-            if new_mode not in self.detectors:
+            if not self.ensure_mode(new_mode):
                 self.logger.error(f"Detector {new_mode.value} não disponível")
                 return False
 
@@ -354,6 +469,18 @@ class SmartParkDetector(LoggerMixin):
             self.logger.error(f"Erro ao alternar modo: {e}")
             return False
 
+    def reset_stream(self):
+        """
+        Notifica os detectores de que a fonte de vídeo reiniciou
+
+        Detectores com estado temporal (ex.: gate de movimento do YOLO)
+        descartam resultados anteriores ao salto.
+        """
+        for detector in self.detectors.values():
+            reset = getattr(detector, "reset_stream", None)
+            if reset is not None:
+                reset()
+
     def get_available_modes(self) -> List[DetectionMode]:
         """Retorna modos de detecção disponíveis"""
         return list(self.detectors.keys())
@@ -375,7 +502,7 @@ class SmartParkDetector(LoggerMixin):
 
         # Obter frame de debug do detector
         debug_frame = detector.get_debug_frame(
-            self.last_frame, self.config.parking_zones, self.last_results
+            self.last_frame, self.parking_zones, self.last_results
         )
 
         # Adicionar informações de resumo
@@ -409,6 +536,8 @@ class SmartParkDetector(LoggerMixin):
                 mode=self.current_mode.value,
                 fps=fps,
                 processing_time=processing_time,
+                # Frames de debug dos detectores já são buffers próprios
+                copy=debug_frame is self.last_frame,
             )
 
         return debug_frame
@@ -446,7 +575,7 @@ class SmartParkDetector(LoggerMixin):
         return stats
 
     def add_status_change_callback(
-        self, callback: Callable[[List[Dict[str, Any]]], None]
+        self, callback: Callable[[Sequence[StatusChange]], None]
     ):
         """
         Adiciona callback para mudanças de status
@@ -471,6 +471,15 @@ class HybridDetector(LoggerMixin):
                 + (1 - alpha) * self.processing_stats["avg_processing_time"]
             )
 
+    def set_detection_scale(self, scale: float):
+        """
+        Repassa a escala dos frames de detecção ao detector threshold
+
+        Args:
+            scale: Fator aplicado à resolução das zonas (1.0 = sem redução)
+        """
+        self.threshold_detector.set_detection_scale(scale)
+
     def get_debug_frame(
         self,
         original_frame,
@@ -552,6 +561,10 @@ class HybridDetector(LoggerMixin):
             "yolo_detector": yolo_stats,
         }
 
+    def reset_stream(self):
+        """Descarta estado que depende da continuidade do vídeo"""
+        self.yolo_detector.reset_stream()
+
     def update_fusion_strategy(self, new_strategy: str):
         """
         Atualiza estratégia de fusão dinamicamente
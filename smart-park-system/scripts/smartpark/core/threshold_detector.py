@@ -11,7 +11,10 @@ from typing import Dict, List, Any, Tuple
 from dataclasses import dataclass
 
 from utils.logger import LoggerMixin, log_execution_time
-from utils.image_utils import ImageProcessor, ParkingZone
+from utils.image_utils import ImageProcessor, ParkingZone, ParkingZoneArray
+from utils._mask_kernel import NUMBA_AVAILABLE
+from utils._mask_kernel import warmup as _warmup_mask_kernel
+from utils._resize_kernel import warmup as _warmup_resize_kernel
 
 
 @dataclass
@@ -52,6 +55,9 @@ class ThresholdDetector(LoggerMixin):
         # Configurações de threshold
         self.threshold = config.get("threshold", 3000)
         self.scale_factor = config.get("scale_factor", 0.67)
+        # O threshold é uma contagem de pixels na resolução das zonas
+        # configuradas; frames reduzidos na captura têm área escala² menor
+        self.area_scale = 1.0
 
         # Configurações de pré-processamento
         self.adaptive_threshold_max_val = config.get("adaptive_threshold_max_val", 255)
@@ -81,8 +87,33 @@ class ThresholdDetector(LoggerMixin):
             config.get("threshold_type", "THRESH_BINARY_INV"), cv2.THRESH_BINARY_INV
         )
 
+        # Pré-processamento via T-API (cv2.UMat) em OpenCL, se disponível
+        self.use_umat = bool(config.get("use_umat", False))
+        if self.use_umat and not cv2.ocl.haveOpenCL():
+            self.logger.info("OpenCL indisponível, pré-processamento na CPU")
+            self.use_umat = False
+        if self.use_umat:
+            cv2.ocl.setUseOpenCL(True)
+
+        # Blur mediano + dilatação fundidos em um kernel Numba (somente CPU)
+        self.fused_postprocess = (
+            NUMBA_AVAILABLE
+            and not self.use_umat
+            and bool(config.get("fused_postprocess", False))
+        )
+        if self.fused_postprocess:
+            _warmup_mask_kernel()
+
+        # Redimensionamento por área com tabela (usado por resize_frame)
+        if NUMBA_AVAILABLE and self.scale_factor < 1.0:
+            _warmup_resize_kernel()
+
         # Estado interno
         self.last_processed_frame = None
+
+        # Bounding boxes das zonas para contagem em lote (cache por lista)
+        self._zone_boxes = None
+        self._zone_boxes_source = None
         self.processing_stats = {"total_detections": 0, "avg_processing_time": 0.0}
 
         self.logger.info(
@@ -110,11 +141,15 @@ class ThresholdDetector(LoggerMixin):
             resized_frame, processed_frame = self._preprocess_image(frame)
             self.last_processed_frame = processed_frame
 
-            # Detectar status de cada zona
+            # Contar pixels de todas as zonas de uma vez e decidir o status
+            pixel_counts = ImageProcessor.count_white_pixels_batch(
+                processed_frame, self._get_zone_boxes(parking_zones)
+            ).tolist()
+
             results = {}
 
-            for zone in parking_zones:
-                zone_result = self._detect_zone_status(processed_frame, zone)
+            for zone, pixel_count in zip(parking_zones, pixel_counts):
+                zone_result = self._detect_zone_status(pixel_count, zone)
 
                 results[zone.code] = {
                     "status": zone_result.status,
@@ -144,7 +179,7 @@ class ThresholdDetector(LoggerMixin):
                     "status": "UNKNOWN",
                     "confidence": 0.0,
                     "pixel_count": 0,
-                    "threshold_used": self.threshold,
+                    "threshold_used": self.effective_threshold,
                     "zone_id": zone.id,
                     "method": "threshold",
                     "processing_time": 0.0,
@@ -163,9 +198,17 @@ class ThresholdDetector(LoggerMixin):
         Returns:
             Tupla (frame_redimensionado, frame_processado)
         """
-        return ImageProcessor.preprocess_for_threshold(
+        scale_factor = self.scale_factor
+        if self.use_umat:
+            # Redimensionar na CPU (lê o frame uma única vez) e enviar a imagem
+            # reduzida para cvtColor/threshold/blur/dilatação via OpenCL
+            resized_frame = ImageProcessor.resize_frame(frame, scale_factor)
+            frame = cv2.UMat(resized_frame)
+            scale_factor = 1.0
+
+        resized, processed = ImageProcessor.preprocess_for_threshold(
             frame=frame,
-            scale_factor=self.scale_factor,
+            scale_factor=scale_factor,
             adaptive_threshold_max_val=self.adaptive_threshold_max_val,
             adaptive_threshold_method=self.adaptive_threshold_method,
             threshold_type=self.threshold_type,
@@ -174,41 +217,59 @@ class ThresholdDetector(LoggerMixin):
             median_blur_ksize=self.median_blur_ksize,
             dilate_kernel_size=self.dilate_kernel_size,
             dilate_iterations=self.dilate_iterations,
+            fused_postprocess=self.fused_postprocess,
         )
 
+        if self.use_umat:
+            # Contagem por ROI exige ndarray: baixar somente a máscara binária
+            return resized_frame, processed.get()
+
+        return resized, processed
+
+    def _get_zone_boxes(self, parking_zones: List[ParkingZone]):
+        """
+        Bounding boxes das zonas em array, recalculadas só quando a lista muda
+
+        Args:
+            parking_zones: Zonas de estacionamento
+
+        Returns:
+            Array (N, 4) com (x1, y1, x2, y2) de cada zona
+        """
+        if self._zone_boxes_source is not parking_zones:
+            self._zone_boxes = ParkingZoneArray.from_zones(parking_zones).bboxes
+            self._zone_boxes_source = parking_zones
+        return self._zone_boxes
+
     def _detect_zone_status(
-        self, processed_frame, zone: ParkingZone
+        self, pixel_count: int, zone: ParkingZone
     ) -> ThresholdDetectionResult:
         """
         Detecta o status de uma zona específica
 
         Args:
-            processed_frame: Frame pré-processado
+            pixel_count: Pixels brancos na zona (frame pré-processado)
             zone: Zona de estacionamento
 
         Returns:
             Resultado da detecção
         """
         start_time = time.time()
-
-        # Contar pixels brancos na zona
-        pixel_count = ImageProcessor.count_white_pixels(processed_frame, zone)
+        threshold = self.effective_threshold
 
         # Determinar status baseado no threshold
-        is_occupied = pixel_count > self.threshold
+        is_occupied = pixel_count > threshold
         status = "OCCUPIED" if is_occupied else "FREE"
 
         # Calcular confiança baseada na diferença do threshold
         if is_occupied:
             # Para vagas ocupadas, confiança aumenta com mais pixels
             confidence = min(
-                0.95, 0.5 + (pixel_count - self.threshold) / (self.threshold * 2)
+                0.95, 0.5 + (pixel_count - threshold) / (threshold * 2)
             )
         else:
             # Para vagas livres, confiança aumenta com menos pixels
-            confidence = min(
-                0.95, 0.5 + (self.threshold - pixel_count) / self.threshold
-            )
+            confidence = min(0.95, 0.5 + (threshold - pixel_count) / threshold)
 
         # Garantir confiança mínima
         confidence = max(0.1, confidence)
@@ -219,7 +280,7 @@ class ThresholdDetector(LoggerMixin):
             status=status,
             pixel_count=pixel_count,
             confidence=confidence,
-            threshold_used=self.threshold,
+            threshold_used=threshold,
             zone_code=zone.code,
             processing_time=processing_time,
         )
@@ -262,8 +323,13 @@ class ThresholdDetector(LoggerMixin):
         debug_frame = ImageProcessor.resize_frame(original_frame, self.scale_factor)
 
         # Desenhar zonas e resultados
+        # resize_frame já devolve um frame novo (exceto com escala 1.0)
         debug_frame = ImageProcessor.draw_parking_zones(
-            debug_frame, parking_zones, results, show_pixel_count=True
+            debug_frame,
+            parking_zones,
+            results,
+            show_pixel_count=True,
+            copy=debug_frame is original_frame,
         )
 
         return debug_frame
@@ -277,6 +343,23 @@ class ThresholdDetector(LoggerMixin):
         """
         return self.last_processed_frame
 
+    @property
+    def effective_threshold(self) -> float:
+        """Threshold comparado com a contagem de pixels dos frames recebidos"""
+        return self.threshold * self.area_scale
+
+    def set_detection_scale(self, scale: float):
+        """
+        Ajusta o threshold à escala dos frames de detecção
+
+        Args:
+            scale: Fator aplicado à resolução das zonas (1.0 = sem redução)
+        """
+        self.area_scale = scale * scale
+        self.logger.info(
+            f"Threshold efetivo para escala {scale:.3f}: {self.effective_threshold:.0f}"
+        )
+
     def update_threshold(self, new_threshold: int):
         """
         Atualiza o threshold dinamicamente
@@ -298,6 +381,7 @@ class ThresholdDetector(LoggerMixin):
         return {
             "detector_type": "threshold",
             "threshold": self.threshold,
+            "effective_threshold": self.effective_threshold,
             "scale_factor": self.scale_factor,
             "total_detections": self.processing_stats["total_detections"],
             "avg_processing_time": self.processing_stats["avg_processing_time"],
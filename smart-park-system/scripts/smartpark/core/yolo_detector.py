@@ -5,11 +5,16 @@ Este módulo implementa detecção de vagas usando modelos YOLO para
 identificação de veículos com maior precisão e robustez.
 """
 
+import threading
 import time
+from collections import OrderedDict
 from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
+import cv2
+import numpy as np
+
 try:
     from ultralytics import YOLO
     import torch
@@ -19,8 +24,19 @@ except ImportError:
     YOLO_AVAILABLE = False
     YOLO = None
 
+# NMS do ultralytics (movido para utils.nms nas versões mais recentes)
+try:
+    from ultralytics.utils.nms import non_max_suppression
+except ImportError:
+    try:
+        from ultralytics.utils.ops import non_max_suppression
+    except ImportError:
+        non_max_suppression = None
+
 from utils.logger import LoggerMixin, log_execution_time
-from utils.image_utils import ImageProcessor, ParkingZone
+from utils.image_utils import ImageProcessor, ParkingZone, ParkingZoneArray
+from ._zone_kernel import NUMBA_AVAILABLE, assign_vehicles_to_zones, box_iou
+from ._zone_kernel import warmup as _warmup_zone_kernel
 
 
 @dataclass
@@ -47,6 +63,11 @@ class VehicleDetection:
     center_point: Tuple[float, float]
 
 
+def _fused_preprocess(u8_hwc, dtype):
+    """BGR uint8 HWC -> RGB float NCHW /255 (fundido em um kernel pelo torch.compile)"""
+    return u8_hwc.flip(-1).permute(2, 0, 1).unsqueeze(0).to(dtype).div(255.0)
+
+
 class YOLODetector(LoggerMixin):
     """
     Detector de vagas baseado em YOLO para identificação de veículos.
@@ -58,6 +79,12 @@ class YOLODetector(LoggerMixin):
     # Mapeamento de classes COCO para veículos
     VEHICLE_CLASSES = {2: "car", 3: "motorcycle", 5: "bus", 7: "truck"}
 
+    # Janela (potência de 2) das estatísticas de processamento
+    STATS_WINDOW = 256
+
+    # Frames avaliados entre ajustes automáticos de imgsz
+    AUTOTUNE_INTERVAL = 30
+
     def __init__(self, config: Dict[str, Any] = None):
         """
         Inicializa o detector YOLO
@@ -86,20 +113,113 @@ class YOLODetector(LoggerMixin):
         self.imgsz = config.get("imgsz", 640)
         self.max_det = config.get("max_det", 300)
 
+        # Ajuste automático de imgsz: reduz em passos de 32 enquanto o tempo
+        # médio por frame exceder target_ms (None = desabilitado)
+        self.target_ms = config.get("target_ms")
+        self.min_imgsz = config.get("min_imgsz", 320)
+        self._frames_since_resize = 0
+
+        # Protege a troca de modelo/imgsz contra frames em processamento
+        self._model_lock = threading.RLock()
+
+        # Meia precisão na GPU (ignorada na CPU e em GPUs sem tensor cores)
+        self.use_half = config.get("half", True)
+        self.half = False
+        self._input_dtype = None
+        self._half_kwargs: Dict[str, Any] = {}
+
         # Classes de veículos a detectar
         vehicle_classes = config.get("vehicle_classes", [2, 5, 7])
         self.vehicle_classes = set(vehicle_classes)
 
+        # Caminho rápido: letterbox via cv2 e inferência direta na rede,
+        # sem o pré-processamento genérico do predictor do ultralytics
+        self.fast_preprocess = config.get("fast_preprocess", False)
+        self._net = None
+        self._stride = 32
+        self._letterbox_params: Optional[Dict[str, Any]] = None
+        self._letterbox_shape: Optional[Tuple[int, ...]] = None
+        self._letterbox_buf: Optional[np.ndarray] = None
+        self._host_tensor = None
+        self._dev_u8 = None
+        self._input_buf = None
+
+        # Pré-processamento fundido (BGR->RGB, float, /255, CHW) compilado
+        # com torch.compile; sem a flag usa cópias por canal no buffer de entrada
+        self.compile_preprocess = config.get("compile_preprocess", False)
+        self._compiled_preprocess = None
+
+        # CUDA Graph do pré-processamento + rede (entrada de formato fixo),
+        # reexecutado com replay() a cada frame no caminho rápido síncrono
+        self.cuda_graph = config.get("cuda_graph", False)
+        self._graph = None
+        self._graph_out = None
+
+        # NMS + mapeamento das caixas compilados com torch.compile (formato fixo)
+        self.compile_postprocess = config.get("compile_postprocess", False)
+        self._postprocess_fn = None
+        self._vc_tensor = None
+
+        # Pipeline assíncrono CUDA (upload e inferência em streams separados,
+        # resultado com um frame de atraso); implica o caminho rápido
+        self.async_pipeline = config.get("async_pipeline", False)
+        self._upload_stream = None
+        self._infer_stream = None
+        self._host_ring: List[Any] = []
+        self._host_ring_np: List[np.ndarray] = []
+        self._dev_ring: List[Any] = []
+        self._dev_input_ring: List[Any] = []
+        self._pending: List[Optional[Tuple[Any, Any]]] = [None, None]
+        self._pipeline_index = 0
+
+        # Cache por lista de zonas (id -> referência, bboxes, áreas, códigos,
+        # ids, dicionário de resultados reutilizado); as zonas são estáticas
+        self._zones_cache: Dict[
+            int,
+            Tuple[
+                List[ParkingZone],
+                np.ndarray,
+                np.ndarray,
+                List[str],
+                List[Any],
+                Dict[str, Dict[str, Any]],
+            ],
+        ] = {}
+
+        # Gate temporal: reaproveita o último resultado quando o frame reduzido
+        # difere pouco do frame da última inferência (0 = desabilitado)
+        self.motion_threshold = config.get("motion_threshold", 0.0)
+        self.motion_downsample = config.get("motion_downsample", 64)
+        self.max_cache_age = config.get("max_cache_age", 5.0)
+        self._prev_small: Optional[np.ndarray] = None
+        self._prev_zones: Optional[List[ParkingZone]] = None
+        self._prev_zone_results: Optional[Dict[str, Dict[str, Any]]] = None
+        self._prev_inference_time = 0.0
+        self.skipped_frames = 0
+
+        # Visualização: canvas reutilizado e textos das detecções em cache
+        self._debug_canvas: Optional[np.ndarray] = None
+        self._label_cache: Dict[Tuple[str, int], str] = {}
+
+        # Atribuição de veículos às zonas com kernel Numba (fallback NumPy)
+        self.use_numba = NUMBA_AVAILABLE and config.get("numba_assign", True)
+        if self.use_numba:
+            _warmup_zone_kernel()
+
+        # Cache LRU de modelos carregados (caminho, dispositivo, half) para
+        # alternar entre modelos sem recarregar pesos na GPU
+        self.model_cache_size = max(1, config.get("model_cache_size", 2))
+        self._engine_cache: "OrderedDict[Tuple[str, str, bool], Any]" = OrderedDict()
+
         # Carregar modelo
         self.model = None
         self._load_model()
 
-        # Estado interno
-        self.processing_stats = {
-            "total_detections": 0,
-            "avg_processing_time": 0.0,
-            "avg_detections_per_frame": 0.0,
-        }
+        # Estado interno: anel com os últimos STATS_WINDOW frames; as médias
+        # são calculadas apenas quando as estatísticas são lidas
+        self._pt_ring = np.zeros(self.STATS_WINDOW, dtype=np.float32)
+        self._dc_ring = np.zeros(self.STATS_WINDOW, dtype=np.int32)
+        self._ring_i = 0
 
         self.logger.info(f"YOLODetector inicializado com modelo: {self.model_path}")
         self.logger.info(
@@ -140,21 +260,149 @@ class YOLODetector(LoggerMixin):
                                 f"Modelo não encontrado em {self.model_path}, será baixado automaticamente"
                             )
 
-            # Carregar modelo
-            self.model = YOLO(self.model_path)
+            # Modelo já carregado neste dispositivo/precisão: apenas trocar a referência
+            cache_key = (self.model_path, self.device, self.use_half)
+            cached_model = self._engine_cache.get(cache_key)
 
-            # Configurar dispositivo
-            if self.device != "cpu" and torch.cuda.is_available():
-                self.model.to(self.device)
-                self.logger.info(f"Modelo carregado na GPU: {self.device}")
+            if cached_model is not None:
+                self._engine_cache.move_to_end(cache_key)
+                self.model = cached_model
+                if self.device != "cpu" and not torch.cuda.is_available():
+                    self.device = "cpu"
+                self.logger.info(f"Modelo reutilizado do cache: {self.model_path}")
             else:
-                self.device = "cpu"
-                self.logger.info("Modelo carregado na CPU")
+                # Carregar modelo
+                self.model = YOLO(self.model_path)
+
+                # Configurar dispositivo
+                if self.device != "cpu" and torch.cuda.is_available():
+                    self.model.to(self.device)
+                    self.logger.info(f"Modelo carregado na GPU: {self.device}")
+                else:
+                    self.device = "cpu"
+                    self.logger.info("Modelo carregado na CPU")
+
+                self._engine_cache[cache_key] = self.model
+                while len(self._engine_cache) > self.model_cache_size:
+                    evicted_key, _ = self._engine_cache.popitem(last=False)
+                    self.logger.info(f"Modelo removido do cache: {evicted_key[0]}")
+
+            # FP16 apenas em GPUs com tensor cores (compute capability >= 7.0)
+            self.half = False
+            if self.use_half and self.device != "cpu":
+                major, _ = torch.cuda.get_device_capability(self.device)
+                self.half = major >= 7
+                if self.half:
+                    self.logger.info("Inferência em meia precisão (FP16) habilitada")
+            self._input_dtype = torch.float16 if self.half else torch.float32
+            self._half_kwargs = {"half": True} if self.half else {}
+
+            # Classes de veículos no dispositivo para filtrar com torch.isin
+            self._vc_tensor = torch.tensor(
+                sorted(self.vehicle_classes), dtype=torch.long, device=self.device
+            )
+
+            if self.async_pipeline and self.device == "cpu":
+                self.logger.warning("Pipeline assíncrono requer CUDA, desabilitado")
+                self.async_pipeline = False
+
+            if self.cuda_graph and self.device == "cpu":
+                self.logger.warning("CUDA Graph requer CUDA, desabilitado")
+                self.cuda_graph = False
+
+            if self.cuda_graph and self.async_pipeline:
+                self.logger.warning(
+                    "CUDA Graph não é usado com o pipeline assíncrono, desabilitado"
+                )
+                self.cuda_graph = False
+
+            # Grafo e pós-processamento compilado operam no caminho rápido síncrono
+            if self.cuda_graph or self.compile_postprocess:
+                self.fast_preprocess = True
+
+            if self.fast_preprocess or self.async_pipeline:
+                self._setup_fast_path()
 
         except Exception as e:
             self.logger.error(f"Erro ao carregar modelo YOLO: {str(e)}")
             raise
 
+    def _setup_fast_path(self):
+        """Prepara a rede para inferência direta (caminho rápido)"""
+        if non_max_suppression is None:
+            self.logger.warning("NMS do ultralytics indisponível, caminho rápido desabilitado")
+            self.fast_preprocess = False
+            self.async_pipeline = False
+            return
+
+        self._net = self.model.model.fuse().eval().to(self.device)
+        if self.half:
+            self._net.half()
+        self._stride = max(int(self._net.stride.max()), 32)
+
+        # O grafo já elimina o overhead de lançamento dos kernels do pré-processamento
+        if self.compile_preprocess and self.cuda_graph:
+            self.logger.info("CUDA Graph ativo, pré-processamento compilado ignorado")
+        elif self.compile_preprocess:
+            if hasattr(torch, "compile"):
+                self._compiled_preprocess = torch.compile(
+                    _fused_preprocess, fullgraph=True, dynamic=False
+                )
+            else:
+                self.logger.warning("torch.compile indisponível, pré-processamento não compilado")
+
+        self._postprocess_fn = self._postprocess
+        if self.compile_postprocess:
+            if hasattr(torch, "compile"):
+                self._postprocess_fn = torch.compile(self._postprocess, dynamic=False)
+            else:
+                self.logger.warning("torch.compile indisponível, pós-processamento não compilado")
+
+        if self.async_pipeline:
+            self._upload_stream = torch.cuda.Stream(device=self.device)
+            self._infer_stream = torch.cuda.Stream(device=self.device)
+            self._pipeline_index = 0
+
+        # Buffers dependem da resolução do frame, alocados no primeiro frame
+        self._letterbox_shape = None
+
+    def _prepare_input_buffers(self, frame_shape: Tuple[int, ...]):
+        """
+        Calcula letterbox e aloca buffers de entrada para uma resolução de frame
+
+        Args:
+            frame_shape: Formato do frame de entrada
+        """
+        params = ImageProcessor.compute_letterbox(frame_shape, self.imgsz, self._stride)
+        out_h, out_w = params["out_shape"]
+
+        # Buffer do letterbox (BGR) compartilha memória com o tensor host,
+        # pinned quando a inferência é na GPU
+        self._host_tensor = torch.empty(
+            (out_h, out_w, 3), dtype=torch.uint8, pin_memory=self.device != "cpu"
+        )
+        self._letterbox_buf = self._host_tensor.numpy()
+
+        if self.device != "cpu":
+            self._dev_u8 = torch.empty(
+                (out_h, out_w, 3), dtype=torch.uint8, device=self.device
+            )
+
+        self._input_buf = torch.empty(
+            (1, 3, out_h, out_w), dtype=self._input_dtype, device=self.device
+        )
+
+        self._letterbox_params = params
+        self._letterbox_shape = frame_shape
+
+        if self.cuda_graph:
+            self._capture_graph()
+
+        self.logger.info(
+            f"Caminho rápido YOLO: entrada {out_w}x{out_h} para frame "
+            f"{frame_shape[1]}x{frame_shape[0]}"
+        )
+
     @log_execution_time("smartpark.yolo")
     def process_frame(
         self, frame, parking_zones: List[ParkingZone]
@@ -168,39 +416,84 @@ class YOLODetector(LoggerMixin):
 
         Returns:
             Dicionário com resultados por zona
+
+        Note:
+            O dicionário retornado (e os dicionários de cada zona) é reutilizado
+            e sobrescrito no próximo process_frame com a mesma lista de zonas.
+            Quem precisar guardar ou modificar os resultados deve copiá-los.
         """
+        # Troca de modelo/imgsz aguarda o frame em andamento
+        with self._model_lock:
+            return self._process_frame(frame, parking_zones)
+
+    def _process_frame(
+        self, frame, parking_zones: List[ParkingZone]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Implementação de process_frame (executada com o lock do modelo)"""
         start_time = time.time()
 
         try:
+            # Cena estática: reaproveitar resultado da última inferência
+            small = None
+            if self.motion_threshold > 0:
+                small = cv2.resize(
+                    frame,
+                    (self.motion_downsample, self.motion_downsample),
+                    interpolation=cv2.INTER_AREA,
+                )
+                if self._is_static_frame(small, parking_zones, start_time):
+                    self.skipped_frames += 1
+                    results = self._prev_zone_results
+                    elapsed = (time.time() - start_time) / max(len(results), 1)
+                    for zone_entry in results.values():
+                        zone_entry["processing_time"] = elapsed
+                    return results
+
             # Executar detecção YOLO
             vehicle_detections = self._detect_vehicles(frame)
 
-            # Analisar cada zona de estacionamento
-            results = {}
-
-            for zone in parking_zones:
-                zone_result = self._analyze_zone(zone, vehicle_detections)
-
-                results[zone.code] = {
-                    "status": zone_result.status,
-                    "confidence": zone_result.confidence,
-                    "vehicle_type": zone_result.vehicle_type,
-                    "vehicle_count": zone_result.vehicle_count,
-                    "detections": zone_result.detections,
-                    "zone_id": zone.id,
-                    "method": "yolo",
-                    "processing_time": zone_result.processing_time,
-                }
+            # Atribuir veículos a todas as zonas de uma vez
+            assign_start = time.time()
+            _, zones_np, zone_areas, zone_codes, _, results = self._get_zone_arrays(
+                parking_zones
+            )
+            zone_indices = self._assign_vehicles_to_zones(
+                zones_np, zone_areas, vehicle_detections
+            )
+            assign_time = (time.time() - assign_start) / max(len(zone_codes), 1)
+
+            # Analisar cada zona, preenchendo os dicionários pré-alocados
+            for zone_code, indices in zip(zone_codes, zone_indices):
+                zone_result = self._build_zone_result(
+                    zone_code, [vehicle_detections[i] for i in indices], assign_time
+                )
+
+                zone_entry = results[zone_code]
+                zone_entry["status"] = zone_result.status
+                zone_entry["confidence"] = zone_result.confidence
+                zone_entry["vehicle_type"] = zone_result.vehicle_type
+                zone_entry["vehicle_count"] = zone_result.vehicle_count
+                zone_entry["detections"] = zone_result.detections
+                zone_entry["processing_time"] = zone_result.processing_time
 
             # Atualizar estatísticas
             total_processing_time = time.time() - start_time
             self._update_stats(total_processing_time, len(vehicle_detections))
 
+            if self.target_ms:
+                self._autotune_imgsz()
+
             self.logger.debug(
                 f"YOLO processamento concluído em {total_processing_time:.3f}s, "
                 f"{len(vehicle_detections)} veículos detectados"
             )
 
+            if small is not None:
+                self._prev_small = small
+                self._prev_zones = parking_zones
+                self._prev_zone_results = results
+                self._prev_inference_time = start_time
+
             return results
 
         except Exception as e:
@@ -221,6 +514,53 @@ class YOLODetector(LoggerMixin):
                 for zone in parking_zones
             }
 
+    def _is_static_frame(
+        self, small, parking_zones: List[ParkingZone], now: float
+    ) -> bool:
+        """
+        Verifica se o frame reduzido é praticamente igual ao da última inferência
+
+        A comparação é sempre contra o frame da última inferência (não o
+        anterior), para que mudanças lentas acumuladas também disparem
+        uma nova detecção.
+
+        Args:
+            small: Frame reduzido atual
+            parking_zones: Zonas de estacionamento
+            now: Timestamp atual
+
+        Returns:
+            True se o resultado anterior pode ser reaproveitado
+        """
+        if (
+            self._prev_zone_results is None
+            or self._prev_zones is not parking_zones
+            or self._prev_small.shape != small.shape
+            or now - self._prev_inference_time > self.max_cache_age
+        ):
+            return False
+
+        # Diferença absoluta média por pixel/canal
+        diff = cv2.norm(small, self._prev_small, cv2.NORM_L1) / small.size
+        return diff < self.motion_threshold
+
+    def reset_stream(self):
+        """
+        Descarta estado que depende da continuidade do vídeo
+
+        Chamado quando a fonte reinicia (ex.: loop do arquivo), para que o
+        gate temporal e o pipeline assíncrono não reaproveitem resultados de
+        antes do salto.
+        """
+        self._reset_motion_gate()
+        self._pending = [None, None]
+
+    def _reset_motion_gate(self):
+        """Descarta o resultado guardado pelo gate temporal"""
+        self._prev_small = None
+        self._prev_zones = None
+        self._prev_zone_results = None
+
     def _detect_vehicles(self, frame) -> List[VehicleDetection]:
         """
         Detecta todos os veículos no frame
@@ -231,6 +571,24 @@ class YOLODetector(LoggerMixin):
         Returns:
             Lista de detecções de veículos
         """
+        if self.async_pipeline:
+            try:
+                return self._detect_vehicles_async(frame)
+            except Exception as e:
+                self.logger.warning(
+                    f"Falha no pipeline assíncrono CUDA, usando caminho síncrono: {e}"
+                )
+                self.async_pipeline = False
+
+        if self.fast_preprocess:
+            try:
+                return self._detect_vehicles_fast(frame)
+            except Exception as e:
+                self.logger.warning(
+                    f"Falha no caminho rápido YOLO, usando predictor padrão: {e}"
+                )
+                self.fast_preprocess = False
+
         # Executar inferência YOLO
         results = self.model(
             frame,
@@ -240,41 +598,366 @@ class YOLODetector(LoggerMixin):
             imgsz=self.imgsz,
             max_det=self.max_det,
             verbose=False,
+            **self._half_kwargs,
         )
 
-        vehicle_detections = []
+        if not results or results[0].boxes is None or len(results[0].boxes) == 0:
+            return []
 
-        # Processar resultados
-        if results and len(results) > 0:
-            detections = results[0]
+        boxes = results[0].boxes
 
-            if detections.boxes is not None:
-                boxes = detections.boxes
+        # Filtrar classes de veículos no dispositivo e copiar tudo de uma vez
+        mask = torch.isin(boxes.cls.long(), self._vc_tensor)
 
-                for i in range(len(boxes)):
-                    class_id = int(boxes.cls[i])
+        return self._build_vehicle_detections(
+            boxes.xyxy[mask].cpu().numpy(),  # x1, y1, x2, y2
+            boxes.conf[mask].cpu().numpy(),
+            boxes.cls[mask].long().cpu().numpy(),
+        )
 
-                    # Filtrar apenas classes de veículos
-                    if class_id in self.vehicle_classes:
-                        bbox = boxes.xyxy[i].cpu().numpy()  # x1, y1, x2, y2
-                        confidence = float(boxes.conf[i])
+    def _detect_vehicles_fast(self, frame) -> List[VehicleDetection]:
+        """
+        Detecta veículos com letterbox próprio e inferência direta na rede
 
-                        # Calcular centro
-                        center_x = (bbox[0] + bbox[2]) / 2
-                        center_y = (bbox[1] + bbox[3]) / 2
+        Args:
+            frame: Frame de entrada (BGR)
 
-                        vehicle_detection = VehicleDetection(
-                            bbox=tuple(bbox),
-                            confidence=confidence,
-                            class_id=class_id,
-                            class_name=self.VEHICLE_CLASSES.get(class_id, "unknown"),
-                            center_point=(center_x, center_y),
-                        )
+        Returns:
+            Lista de detecções de veículos
+        """
+        if frame.shape != self._letterbox_shape:
+            self._prepare_input_buffers(frame.shape)
+
+        # Letterbox direto no buffer pré-alocado (BGR->RGB fica no pré-processamento)
+        ImageProcessor.letterbox(frame, self._letterbox_params, out=self._letterbox_buf)
+
+        with torch.inference_mode():
+            # Upload em uint8 (1/4 do tráfego de um tensor float)
+            src = self._host_tensor
+            if self._dev_u8 is not None:
+                src = self._dev_u8.copy_(src, non_blocking=True)
+
+            if self._graph is not None:
+                # Entrada estática já atualizada pelo upload acima
+                self._graph.replay()
+                det = self._postprocess_fn(
+                    self._graph_out, self._letterbox_params, frame.shape
+                )
+            else:
+                det = self._forward(
+                    src, self._input_buf, self._letterbox_params, frame.shape
+                )
+            det = det[torch.isin(det[:, 5].long(), self._vc_tensor)].cpu().numpy()
+
+        return self._build_vehicle_detections(det[:, :4], det[:, 4], det[:, 5])
+
+    def _forward(self, src, input_buf, params: Dict[str, Any], frame_shape):
+        """
+        Normaliza a imagem, executa a rede e aplica NMS
+
+        Args:
+            src: Tensor uint8 (H, W, 3) BGR já com letterbox
+            input_buf: Tensor float (1, 3, H, W) de entrada da rede
+            params: Parâmetros do letterbox
+            frame_shape: Formato do frame original
+
+        Returns:
+            Tensor (N, 6) no dispositivo com caixas em coordenadas do frame
+        """
+        preds = self._net(self._preprocess(src, input_buf))
+        return self._postprocess_fn(preds, params, frame_shape)
+
+    def _postprocess(self, preds, params: Dict[str, Any], frame_shape):
+        """
+        Aplica NMS e mapeia as caixas para coordenadas do frame original
+
+        Args:
+            preds: Saída bruta da rede
+            params: Parâmetros do letterbox
+            frame_shape: Formato do frame original
+
+        Returns:
+            Tensor (N, 6) no dispositivo com caixas em coordenadas do frame
+        """
+        det = non_max_suppression(
+            preds,
+            conf_thres=self.confidence,
+            iou_thres=self.iou_threshold,
+            max_det=self.max_det,
+        )[0]
+
+        # Mapear caixas de volta para coordenadas do frame original
+        boxes = det[:, :4]
+        boxes[:, [0, 2]] -= params["left"]
+        boxes[:, [1, 3]] -= params["top"]
+        boxes /= params["gain"]
+        boxes[:, [0, 2]] = boxes[:, [0, 2]].clamp(0, frame_shape[1])
+        boxes[:, [1, 3]] = boxes[:, [1, 3]].clamp(0, frame_shape[0])
+
+        return det
+
+    def _capture_graph(self):
+        """
+        Captura pré-processamento + rede em um CUDA Graph para a entrada atual
+
+        O NMS tem saída de tamanho variável e fica fora do grafo.
+        """
+        self._graph = None
+        self._graph_out = None
+
+        try:
+            with torch.inference_mode():
+                # Aquecimento em stream lateral antes da captura
+                side_stream = torch.cuda.Stream(device=self.device)
+                side_stream.wait_stream(torch.cuda.current_stream(self.device))
+                with torch.cuda.stream(side_stream):
+                    for _ in range(3):
+                        self._net(self._preprocess(self._dev_u8, self._input_buf))
+                torch.cuda.current_stream(self.device).wait_stream(side_stream)
+
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph):
+                    graph_out = self._net(
+                        self._preprocess(self._dev_u8, self._input_buf)
+                    )
+
+            self._graph = graph
+            self._graph_out = graph_out
+            self.logger.info("CUDA Graph capturado para inferência YOLO")
 
-                        vehicle_detections.append(vehicle_detection)
+        except Exception as e:
+            self.logger.warning(f"Falha ao capturar CUDA Graph, usando execução normal: {e}")
+            self.cuda_graph = False
+
+    def _preprocess(self, src, input_buf):
+        """
+        Converte BGR uint8 HWC em RGB float NCHW normalizado
+
+        Args:
+            src: Tensor uint8 (H, W, 3) BGR
+            input_buf: Tensor float/half (1, 3, H, W) de destino
+
+        Returns:
+            Tensor de entrada da rede
+        """
+        if self._compiled_preprocess is not None:
+            return self._compiled_preprocess(src, self._input_dtype)
+
+        # Troca de canais, permute e cast numa cópia por canal, sem intermediários
+        for channel in range(3):
+            input_buf[0, channel].copy_(src[..., 2 - channel])
+
+        return input_buf.div_(255.0)
+
+    def _prepare_pipeline_buffers(self, frame_shape: Tuple[int, ...]):
+        """
+        Aloca o anel de buffers (2 slots) do pipeline assíncrono CUDA
+
+        Args:
+            frame_shape: Formato do frame de entrada
+        """
+        self._prepare_input_buffers(frame_shape)
+        out_h, out_w = self._letterbox_params["out_shape"]
+
+        self._host_ring = [
+            torch.empty((out_h, out_w, 3), dtype=torch.uint8, pin_memory=True)
+            for _ in range(2)
+        ]
+        self._host_ring_np = [t.numpy() for t in self._host_ring]
+        self._dev_ring = [
+            torch.empty((out_h, out_w, 3), dtype=torch.uint8, device=self.device)
+            for _ in range(2)
+        ]
+        self._dev_input_ring = [
+            torch.empty((1, 3, out_h, out_w), dtype=self._input_dtype, device=self.device)
+            for _ in range(2)
+        ]
+
+        # Descartar resultados pendentes da resolução anterior
+        self._pending = [None, None]
+
+    def _detect_vehicles_async(self, frame) -> List[VehicleDetection]:
+        """
+        Detecta veículos com pipeline CUDA de dois streams
+
+        O upload do frame atual (stream de upload) se sobrepõe à inferência
+        (stream de inferência) e o resultado devolvido é o do frame anterior,
+        escondendo a sincronização da cópia GPU->CPU. Latência de um frame.
+
+        Args:
+            frame: Frame de entrada (BGR)
+
+        Returns:
+            Lista de detecções de veículos do frame anterior
+        """
+        if frame.shape != self._letterbox_shape:
+            self._prepare_pipeline_buffers(frame.shape)
+
+        slot = self._pipeline_index
+        self._pipeline_index ^= 1
+        params = self._letterbox_params
+
+        # Letterbox direto no buffer pinned do slot atual
+        ImageProcessor.letterbox(frame, params, out=self._host_ring_np[slot])
+
+        with torch.inference_mode():
+            # Upload assíncrono H2D
+            with torch.cuda.stream(self._upload_stream):
+                self._dev_ring[slot].copy_(self._host_ring[slot], non_blocking=True)
+
+            # Inferência aguarda apenas o upload deste slot
+            self._infer_stream.wait_stream(self._upload_stream)
+            with torch.cuda.stream(self._infer_stream):
+                det = self._forward(
+                    self._dev_ring[slot], self._dev_input_ring[slot], params, frame.shape
+                )
+                det = det[torch.isin(det[:, 5].long(), self._vc_tensor)]
+                det_host = det.to("cpu", non_blocking=True)
+                done = torch.cuda.Event()
+                done.record(self._infer_stream)
+
+            self._pending[slot] = (det_host, done)
+
+            # Primeiro frame: sem resultado anterior, aguardar o atual
+            previous = self._pending[slot ^ 1]
+            if previous is None:
+                previous = self._pending[slot]
+
+            det_host, done = previous
+            done.synchronize()
+
+        det = det_host.numpy()
+        return self._build_vehicle_detections(det[:, :4], det[:, 4], det[:, 5])
+
+    def _build_vehicle_detections(
+        self, xyxy: np.ndarray, confidences: np.ndarray, class_ids: np.ndarray
+    ) -> List[VehicleDetection]:
+        """
+        Converte arrays de detecção em objetos VehicleDetection
+
+        Args:
+            xyxy: Caixas (N, 4) no formato x1, y1, x2, y2
+            confidences: Confianças (N,)
+            class_ids: Classes COCO (N,), já filtradas para veículos
+
+        Returns:
+            Lista de detecções de veículos
+        """
+        vehicle_detections = []
+
+        for bbox, confidence, class_id in zip(xyxy, confidences, class_ids):
+            class_id = int(class_id)
+
+            center_x = (bbox[0] + bbox[2]) / 2
+            center_y = (bbox[1] + bbox[3]) / 2
+
+            vehicle_detections.append(
+                VehicleDetection(
+                    bbox=tuple(bbox),
+                    confidence=float(confidence),
+                    class_id=class_id,
+                    class_name=self.VEHICLE_CLASSES.get(class_id, "unknown"),
+                    center_point=(center_x, center_y),
+                )
+            )
 
         return vehicle_detections
 
+    def _get_zone_arrays(self, parking_zones: List[ParkingZone]):
+        """
+        Obtém (com cache) os arrays pré-calculados de uma lista de zonas
+
+        Args:
+            parking_zones: Lista de zonas de estacionamento
+
+        Returns:
+            Tupla (zonas, bboxes (Z, 4) float32, áreas (Z,), códigos, ids,
+            dicionário de resultados por zona)
+        """
+        key = id(parking_zones)
+        entry = self._zones_cache.get(key)
+
+        # A referência guardada evita reaproveitar um id de lista já coletada
+        if entry is not None and entry[0] is parking_zones:
+            return entry
+
+        zone_array = ParkingZoneArray.from_zones(parking_zones)
+        zones_np = zone_array.bboxes.astype(np.float32)
+        zone_areas = (zones_np[:, 2] - zones_np[:, 0]) * (zones_np[:, 3] - zones_np[:, 1])
+        zone_codes = zone_array.codes
+        zone_ids = [zone.id for zone in parking_zones]
+
+        # Poucas listas de zonas coexistem; limitar o cache por segurança
+        if len(self._zones_cache) >= 8:
+            self._zones_cache.clear()
+
+        results = {
+            zone.code: {
+                "status": None,
+                "confidence": 0.0,
+                "vehicle_type": None,
+                "vehicle_count": 0,
+                "detections": [],
+                "zone_id": zone.id,
+                "method": "yolo",
+                "processing_time": 0.0,
+            }
+            for zone in parking_zones
+        }
+
+        entry = (parking_zones, zones_np, zone_areas, zone_codes, zone_ids, results)
+        self._zones_cache[key] = entry
+        return entry
+
+    def _assign_vehicles_to_zones(
+        self,
+        zones_np: np.ndarray,
+        zone_areas: np.ndarray,
+        vehicle_detections: List[VehicleDetection],
+    ) -> List[np.ndarray]:
+        """
+        Atribui veículos às zonas de forma vetorizada
+
+        Mesmo critério de _analyze_zone: centro do veículo dentro da zona ou
+        sobreposição (IoU) maior que 0.3.
+
+        Args:
+            zones_np: Bboxes das zonas (Z, 4)
+            zone_areas: Áreas das zonas (Z,)
+            vehicle_detections: Lista de detecções de veículos
+
+        Returns:
+            Lista (uma por zona) com os índices dos veículos na zona
+        """
+        if not vehicle_detections:
+            empty = np.empty(0, dtype=np.intp)
+            return [empty] * len(zones_np)
+
+        boxes = np.array([v.bbox for v in vehicle_detections], dtype=np.float32)
+        centers = np.array(
+            [v.center_point for v in vehicle_detections], dtype=np.float32
+        )
+
+        if self.use_numba:
+            out_idx = np.empty((len(zones_np), len(boxes)), dtype=np.int32)
+            out_cnt = np.empty(len(zones_np), dtype=np.int32)
+            assign_vehicles_to_zones(
+                boxes, centers, zones_np, np.float32(0.3), out_idx, out_cnt
+            )
+            return [out_idx[z, : out_cnt[z]] for z in range(len(zones_np))]
+
+        zx1, zy1, zx2, zy2 = (zones_np[:, i, None] for i in range(4))
+        cx, cy = centers[None, :, 0], centers[None, :, 1]
+
+        # Centro do veículo dentro da zona
+        inside = (zx1 <= cx) & (cx <= zx2) & (zy1 <= cy) & (cy <= zy2)
+
+        # Sobreposição das caixas
+        overlap = ImageProcessor.overlap_matrix(zones_np, boxes, zone_areas)
+
+        mask = inside | (overlap > 0.3)
+        return [np.flatnonzero(row) for row in mask]
+
     def _analyze_zone(
         self, zone: ParkingZone, vehicle_detections: List[VehicleDetection]
     ) -> YOLODetectionResult:
@@ -307,14 +990,35 @@ class YOLODetector(LoggerMixin):
                 continue
 
             # Verificar sobreposição de bounding boxes
-            overlap_ratio = ImageProcessor.calculate_overlap_ratio(
-                vehicle.bbox, zone_bbox
-            )
+            overlap_ratio = box_iou(*vehicle.bbox, *zone_bbox)
 
             # Considerar como ocupação se há sobreposição significativa
             if overlap_ratio > 0.3:
                 zone_vehicles.append(vehicle)
 
+        return self._build_zone_result(
+            zone.code, zone_vehicles, time.time() - start_time
+        )
+
+    def _build_zone_result(
+        self,
+        zone_code: str,
+        zone_vehicles: List[VehicleDetection],
+        elapsed: float = 0.0,
+    ) -> YOLODetectionResult:
+        """
+        Monta o resultado de uma zona a partir dos veículos atribuídos a ela
+
+        Args:
+            zone_code: Código da zona
+            zone_vehicles: Veículos atribuídos à zona
+            elapsed: Tempo já gasto na atribuição dos veículos
+
+        Returns:
+            Resultado da análise da zona
+        """
+        start_time = time.time()
+
         # Determinar status
         vehicle_count = len(zone_vehicles)
 
@@ -342,7 +1046,7 @@ class YOLODetector(LoggerMixin):
                 }
             )
 
-        processing_time = time.time() - start_time
+        processing_time = elapsed + time.time() - start_time
 
         return YOLODetectionResult(
             status=status,
@@ -350,30 +1054,27 @@ class YOLODetector(LoggerMixin):
             vehicle_type=vehicle_type,
             vehicle_count=vehicle_count,
             detections=detections_data,
-            zone_code=zone.code,
+            zone_code=zone_code,
             processing_time=processing_time,
         )
 
     def _update_stats(self, processing_time: float, detection_count: int):
         """Atualiza estatísticas internas"""
-        self.processing_stats["total_detections"] += 1
-
-        # Média móvel
-        alpha = 0.1
+        i = self._ring_i & (self.STATS_WINDOW - 1)
+        self._pt_ring[i] = processing_time
+        self._dc_ring[i] = detection_count
+        self._ring_i += 1
 
-        if self.processing_stats["avg_processing_time"] == 0:
-            self.processing_stats["avg_processing_time"] = processing_time
-            self.processing_stats["avg_detections_per_frame"] = detection_count
-        else:
-            self.processing_stats["avg_processing_time"] = (
-                alpha * processing_time
-                + (1 - alpha) * self.processing_stats["avg_processing_time"]
-            )
+    @property
+    def processing_stats(self) -> Dict[str, Any]:
+        """Estatísticas de processamento (médias sobre a janela recente)"""
+        n = min(self._ring_i, self.STATS_WINDOW)
 
-            self.processing_stats["avg_detections_per_frame"] = (
-                alpha * detection_count
-                + (1 - alpha) * self.processing_stats["avg_detections_per_frame"]
-            )
+        return {
+            "total_detections": self._ring_i,
+            "avg_processing_time": float(self._pt_ring[:n].mean()) if n else 0.0,
+            "avg_detections_per_frame": float(self._dc_ring[:n].mean()) if n else 0.0,
+        }
 
     def get_debug_frame(
         self,
@@ -392,57 +1093,85 @@ class YOLODetector(LoggerMixin):
             show_all_detections: Se deve mostrar todas as detecções YOLO
 
         Returns:
-            Frame com visualizações
+            Frame com visualizações (buffer reutilizado, sobrescrito na
+            próxima chamada)
         """
-        import cv2
-
-        debug_frame = original_frame.copy()
+        # Copiar para o canvas persistente em vez de alocar um frame novo
+        if (
+            self._debug_canvas is None
+            or self._debug_canvas.shape != original_frame.shape
+            or self._debug_canvas.dtype != original_frame.dtype
+        ):
+            self._debug_canvas = np.empty_like(original_frame)
 
         # Desenhar zonas de estacionamento
         debug_frame = ImageProcessor.draw_parking_zones(
-            debug_frame, parking_zones, results
+            original_frame, parking_zones, results, out=self._debug_canvas
         )
 
         # Desenhar detecções YOLO se disponíveis
         if results and show_all_detections:
-            for zone_code, zone_result in results.items():
-                if "detections" in zone_result:
-                    for detection in zone_result["detections"]:
-                        bbox = detection["bbox"]
-                        confidence = detection["confidence"]
-                        class_name = detection["class_name"]
-
-                        # Desenhar bounding box do veículo
-                        x1, y1, x2, y2 = map(int, bbox)
-                        cv2.rectangle(debug_frame, (x1, y1), (x2, y2), (255, 0, 0), 2)
-
-                        # Texto com classe e confiança
-                        text = f"{class_name}: {confidence:.2f}"
-                        cv2.putText(
-                            debug_frame,
-                            text,
+            boxes = []
+            labels = []
+
+            for zone_result in results.values():
+                for detection in zone_result.get("detections", ()):
+                    x1, y1, x2, y2 = map(int, detection["bbox"])
+                    boxes.append(
+                        np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]], dtype=np.int32)
+                    )
+                    labels.append(
+                        (
+                            self._detection_label(
+                                detection["class_name"], detection["confidence"]
+                            ),
                             (x1, y1 - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX,
-                            0.5,
-                            (255, 0, 0),
-                            1,
                         )
+                    )
+
+            # Todas as caixas dos veículos em uma única chamada
+            if boxes:
+                cv2.polylines(debug_frame, boxes, True, (255, 0, 0), 2)
+
+            # Texto com classe e confiança
+            for text, origin in labels:
+                cv2.putText(
+                    debug_frame,
+                    text,
+                    origin,
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.5,
+                    (255, 0, 0),
+                    1,
+                )
 
         return debug_frame
 
+    def _detection_label(self, class_name: str, confidence: float) -> str:
+        """Texto 'classe: confiança' com cache por classe e centésimo de confiança"""
+        key = (class_name, int(round(confidence * 100)))
+        label = self._label_cache.get(key)
+
+        if label is None:
+            label = f"{class_name}: {confidence:.2f}"
+            self._label_cache[key] = label
+
+        return label
+
     def get_stats(self) -> Dict[str, Any]:
         """Retorna estatísticas do detector"""
+        processing_stats = self.processing_stats
+
         return {
             "detector_type": "yolo",
             "model_path": self.model_path,
             "device": self.device,
             "confidence_threshold": self.confidence,
             "vehicle_classes": list(self.vehicle_classes),
-            "total_detections": self.processing_stats["total_detections"],
-            "avg_processing_time": self.processing_stats["avg_processing_time"],
-            "avg_detections_per_frame": self.processing_stats[
-                "avg_detections_per_frame"
-            ],
+            "total_detections": processing_stats["total_detections"],
+            "avg_processing_time": processing_stats["avg_processing_time"],
+            "avg_detections_per_frame": processing_stats["avg_detections_per_frame"],
+            "skipped_frames": self.skipped_frames,
         }
 
     def update_confidence_threshold(self, new_confidence: float):
@@ -454,10 +1183,58 @@ class YOLODetector(LoggerMixin):
         """
         old_confidence = self.confidence
         self.confidence = max(0.0, min(1.0, new_confidence))
+        self._reset_motion_gate()
         self.logger.info(
             f"Confiança YOLO atualizada: {old_confidence} -> {self.confidence}"
         )
 
+    def set_imgsz(self, new_imgsz: int):
+        """
+        Altera o tamanho de entrada do modelo em tempo de execução
+
+        O custo da inferência cresce com imgsz²: 640 -> 416 reduz ~58% das
+        operações, ao custo de menor precisão para veículos pequenos ou
+        distantes na imagem.
+
+        Args:
+            new_imgsz: Novo tamanho (ajustado para múltiplo de 32)
+        """
+        new_imgsz = max(32, int(round(new_imgsz / 32)) * 32)
+
+        with self._model_lock:
+            if new_imgsz == self.imgsz:
+                return
+
+            old_imgsz = self.imgsz
+            self.imgsz = new_imgsz
+
+            # Buffers, letterbox e CUDA Graph são refeitos no próximo frame
+            self._letterbox_shape = None
+            self._reset_motion_gate()
+            self._frames_since_resize = 0
+
+            self.logger.info(f"imgsz YOLO alterado: {old_imgsz} -> {new_imgsz}")
+
+    def _autotune_imgsz(self):
+        """Reduz imgsz quando o tempo médio recente excede target_ms"""
+        self._frames_since_resize += 1
+
+        # Avaliar apenas após uma janela completa no tamanho atual
+        if self._frames_since_resize < self.AUTOTUNE_INTERVAL:
+            return
+
+        mask = self.STATS_WINDOW - 1
+        idx = np.arange(self._ring_i - self.AUTOTUNE_INTERVAL, self._ring_i) & mask
+        avg_ms = float(self._pt_ring[idx].mean()) * 1000
+        self._frames_since_resize = 0
+
+        if avg_ms > self.target_ms and self.imgsz - 32 >= self.min_imgsz:
+            self.logger.info(
+                f"Tempo médio {avg_ms:.1f}ms acima do alvo {self.target_ms}ms, "
+                f"reduzindo imgsz"
+            )
+            self.set_imgsz(self.imgsz - 32)
+
     def switch_model(self, new_model_path: str):
         """
         Troca o modelo YOLO dinamicamente
@@ -465,12 +1242,19 @@ class YOLODetector(LoggerMixin):
         Args:
             new_model_path: Caminho para o novo modelo
         """
+        with self._model_lock:
+            self._switch_model(new_model_path)
+
+    def _switch_model(self, new_model_path: str):
+        """Implementação de switch_model (executada com o lock do modelo)"""
         try:
             old_model_path = self.model_path
             self.model_path = new_model_path
 
             self.logger.info(f"Carregando novo modelo: {new_model_path}")
             self._load_model()
+            self._zones_cache.clear()
+            self._reset_motion_gate()
 
             self.logger.info(f"Modelo trocado: {old_model_path} -> {new_model_path}")
 
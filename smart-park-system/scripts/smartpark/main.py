@@ -6,11 +6,17 @@ SmartPark com suporte para múltiplos modos: Threshold, YOLO e Hybrid.
 """
 
 import cv2
+import numpy as np
+import os
 import time
 import argparse
+import queue
+import statistics
 import sys
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Dict, List, Optional
 
 # Adicionar diretório atual ao path para imports
 current_dir = Path(__file__).parent
@@ -20,6 +26,37 @@ sys.path.insert(0, str(current_dir))
 from core import SmartParkDetector, DetectionMode, config, YOLO_AVAILABLE
 from utils import setup_logger, SmartParkLogger
 
+# Teclado não bloqueante pelo terminal (apenas POSIX)
+try:
+    import select
+    import termios
+    import tty
+
+    TERMINAL_KEYS_AVAILABLE = True
+except ImportError:
+    TERMINAL_KEYS_AVAILABLE = False
+
+
+# Paralelizar resize/cvtColor internos do OpenCV, deixando um núcleo livre
+# para as threads de leitura e exibição
+cv2.setUseOptimized(True)
+cv2.setNumThreads(max(1, (os.cpu_count() or 1) - 1))
+
+# Intervalo entre heartbeats automáticos (segundos)
+HEARTBEAT_INTERVAL = 300
+
+# Marcador de fim de fluxo nas filas do pipeline
+_END_OF_STREAM = None
+
+# Frames por janela de diagnóstico da fila de leitura
+QUEUE_CHECK_INTERVAL = 300
+
+# Fração da janela com a fila cheia/vazia que caracteriza o gargalo
+QUEUE_SATURATION_RATIO = 0.9
+
+# Latências recentes mantidas por estágio do pipeline
+LATENCY_WINDOW = 512
+
 
 class SmartParkApp:
     """
@@ -49,7 +86,7 @@ class SmartParkApp:
         # Configurar logging
         log_level = config.get("logging.level", "INFO")
         self.logger = setup_logger("smartpark.main", log_level=log_level)
-        self.smartpark_logger = SmartParkLogger()
+        self.smartpark_logger = SmartParkLogger.get_default()
 
         self.logger.info("=== SmartPark Iniciando ===")
 
@@ -61,7 +98,7 @@ class SmartParkApp:
 
         # Validar e configurar fonte de vídeo
         if video_source:
-            config.video.source = video_source
+            config.set("video.source", video_source)
 
         # Inicializar detector
         self.detector = SmartParkDetector(
@@ -69,6 +106,7 @@ class SmartParkApp:
             mode=self.mode,
             enable_api=enable_api,
             enable_performance_tracking=True,
+            enabled_modes={self.mode},
         )
 
         # Configurar callbacks
@@ -80,10 +118,82 @@ class SmartParkApp:
         self.frame_count = 0
         self.start_time = time.time()
 
-        # Estatísticas de FPS
-        self.fps_counter = 0
-        self.fps_start_time = time.time()
-        self.current_fps = 0.0
+        # Pipeline de threads: leitura -> detecção (thread principal) -> exibição
+        self.prefetch = max(1, int(config.get("video.prefetch", 4)))
+        self._stop_event = threading.Event()
+        self._read_queue: "queue.Queue" = queue.Queue(maxsize=self.prefetch)
+        self._display_queue: "queue.Queue" = queue.Queue(maxsize=2)
+        self._key_queue: "queue.Queue[int]" = queue.Queue()
+        self._reader_thread: Optional[threading.Thread] = None
+        self._display_thread: Optional[threading.Thread] = None
+        self._stdin_thread: Optional[threading.Thread] = None
+        self._stdin_attrs = None
+
+        # Visualização limitada a um orçamento de FPS (0 = todo frame)
+        display_fps = config.get("debug.display_fps", 15)
+        self._draw_interval = 1.0 / display_fps if display_fps else 0.0
+        self._next_draw = 0.0
+
+        # Buffers próprios da exibição, usados em rodízio: frames na fila (até
+        # maxsize) + 1 em imshow. Detectores reutilizam o canvas de debug a
+        # cada desenho, então a fila nunca recebe o buffer deles
+        self._display_buffers: List[Optional[np.ndarray]] = [None] * (
+            self._display_queue.maxsize + 1
+        )
+        self._display_slot = 0
+
+        # Referência (sem cópia) ao último frame de debug exibido, usada ao salvar
+        self._last_debug_view: Optional[np.ndarray] = None
+
+        # Gravação de frames em segundo plano (fila limitada: teclas S repetidas
+        # descartam frames em vez de acumular memória)
+        self._save_queue: "queue.Queue" = queue.Queue(maxsize=8)
+        self._save_thread = threading.Thread(
+            target=self._save_worker, name="smartpark-writer", daemon=True
+        )
+        self._save_thread.start()
+
+        # Pool de buffers de frame pré-alocados, rotacionados entre leitor e
+        # consumidor para que nunca escrevam no mesmo buffer
+        self._frame_pool: "queue.Queue[np.ndarray]" = queue.Queue()
+
+        # Métricas do pipeline. Cada contador é escrito por uma única thread,
+        # então dispensa lock. read()/retrieve() liberam o GIL durante a
+        # decodificação nativa, então a leitura roda em paralelo real com
+        # process_frame
+        self._metrics: Dict[str, int] = {
+            "decoded_frames": 0,
+            "decode_ns": 0,
+            "read_q_hwm": 0,
+            "display_q_hwm": 0,
+            "display_drops": 0,
+            "displayed_frames": 0,
+            "heartbeat_failures": 0,
+        }
+        self._latency_ms: Dict[str, deque] = {
+            stage: deque(maxlen=LATENCY_WINDOW)
+            for stage in ("decode", "process", "display")
+        }
+
+        # Ocupação da fila de leitura na janela atual (fila cheia = detecção é o
+        # gargalo; fila vazia = leitura é o gargalo)
+        self._queue_samples = 0
+        self._queue_full = 0
+        self._queue_empty = 0
+
+        # Escala aplicada aos frames antes da detecção (1.0 = resolução original)
+        self._det_scale: float = 1.0
+
+        # Estatísticas de FPS (calculadas sob demanda a partir de frame_count)
+        self._loop_start_ns = time.monotonic_ns()
+
+        # Tabela de teclas desta instância
+        self._key_handlers = dict(self._KEY_HANDLERS)
+        if YOLO_AVAILABLE:
+            self._key_handlers.update(self._YOLO_KEY_HANDLERS)
+
+        # Próximo heartbeat automático (relógio monotônico, imune a ajustes de hora)
+        self._next_hb = time.monotonic() + HEARTBEAT_INTERVAL
 
         self.logger.info(f"SmartPark inicializado em modo: {mode}")
         self.logger.info(f"API habilitada: {enable_api}")
@@ -94,19 +204,45 @@ class SmartParkApp:
         video_source = str(config.get("video.source", 0))
 
         try:
-            # Verificar se é webcam (número) ou arquivo
-            if video_source.isdigit():
-                self.video_capture = cv2.VideoCapture(int(video_source))
+            # Verificar se é webcam (número ou /dev/video*) ou arquivo
+            is_webcam = video_source.isdigit() or video_source.startswith("/dev/video")
+            source = int(video_source) if video_source.isdigit() else video_source
+
+            # Backend explícito: V4L2 para webcams no Linux, FFmpeg para arquivos/streams
+            if is_webcam:
+                backend = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
                 self.logger.info(f"Usando webcam: {video_source}")
             else:
-                self.video_capture = cv2.VideoCapture(video_source)
+                backend = cv2.CAP_FFMPEG
                 self.logger.info(f"Usando arquivo: {video_source}")
 
+            self.video_capture = cv2.VideoCapture(source, backend)
+
+            # Backend preferido indisponível nesta build: usar o padrão
+            if not self.video_capture.isOpened() and backend != cv2.CAP_ANY:
+                self.video_capture = cv2.VideoCapture(source)
+
             if not self.video_capture.isOpened():
                 raise ValueError(
                     f"Não foi possível abrir fonte de vídeo: {video_source}"
                 )
 
+            if is_webcam:
+                # Buffer mínimo (descarta frames atrasados) e MJPEG, de
+                # decodificação bem mais barata que H.264 na mesma resolução
+                self.video_capture.set(
+                    cv2.CAP_PROP_BUFFERSIZE, config.get("video.buffer_size", 1)
+                )
+                self.video_capture.set(
+                    cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG")
+                )
+
+            fourcc = int(self.video_capture.get(cv2.CAP_PROP_FOURCC))
+            fourcc_str = "".join(chr((fourcc >> (8 * i)) & 0xFF) for i in range(4))
+            self.logger.info(
+                f"Backend: {self.video_capture.getBackendName()}, FOURCC: {fourcc_str}"
+            )
+
             # Obter propriedades do vídeo
             fps = self.video_capture.get(cv2.CAP_PROP_FPS)
             width = int(self.video_capture.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -117,6 +253,22 @@ class SmartParkApp:
                 f"Vídeo: {width}x{height} @ {fps:.1f}FPS, {total_frames} frames"
             )
 
+            # Reduzir uma única vez na captura para a largura de detecção
+            detection_width = config.get("video.detection_width")
+            if detection_width and 0 < int(detection_width) < width:
+                self._det_scale = int(detection_width) / width
+                self.logger.info(
+                    f"Detecção em {int(detection_width)}x"
+                    f"{round(height * self._det_scale)} (escala {self._det_scale:.3f})"
+                )
+            self.detector.set_detection_scale(self._det_scale)
+
+            # Buffers em fila + 1 sendo lido + 1 em processamento + 1 retido
+            # como último frame do detector
+            if width > 0 and height > 0:
+                for _ in range(self.prefetch + 3):
+                    self._frame_pool.put(np.empty((height, width, 3), dtype=np.uint8))
+
         except Exception as e:
             self.logger.error(f"Erro ao configurar vídeo: {e}")
             raise
@@ -124,50 +276,117 @@ class SmartParkApp:
     def _on_status_change(self, changes):
         """Callback para mudanças de status das vagas"""
         for change in changes:
+            # Formatação adiada: nenhuma string é montada se INFO estiver desligado
             self.logger.info(
-                f"Vaga {change['zone_code']}: {change['previous_status']} -> "
-                f"{change['current_status']} (confiança: {change['confidence']:.2f})"
+                "Vaga %s: %s -> %s (confiança: %.2f)",
+                change.zone_code,
+                change.previous_status,
+                change.current_status,
+                change.confidence,
             )
 
-    def _handle_keyboard_input(self):
-        """Processa entrada do teclado"""
-        key = cv2.waitKey(1) & 0xFF
-
-        if key == 27:  # ESC
-            return False
-        elif key == ord("q"):  # Q para sair
-            return False
-        elif key == ord("1"):  # Modo Threshold
-            self.detector.switch_mode(DetectionMode.THRESHOLD)
-            self.logger.info("Modo alterado para: Threshold")
-        elif key == ord("2") and YOLO_AVAILABLE:  # Modo YOLO
-            self.detector.switch_mode(DetectionMode.YOLO)
-            self.logger.info("Modo alterado para: YOLO")
-        elif key == ord("3") and YOLO_AVAILABLE:  # Modo Hybrid
-            self.detector.switch_mode(DetectionMode.HYBRID)
-            self.logger.info("Modo alterado para: Hybrid")
-        elif key == ord("s"):  # Salvar frame atual
-            self._save_current_frame()
-        elif key == ord("m"):  # Mostrar métricas
-            self._print_metrics()
-        elif key == ord("h"):  # Enviar heartbeat manual
-            if self.detector.send_heartbeat():
-                self.logger.info("Heartbeat enviado")
-            else:
-                self.logger.warning("Falha ao enviar heartbeat")
+    def _quit_key(self) -> bool:
+        """Tecla de saída (ESC ou Q)"""
+        return False
 
+    def _mode_key(self, mode: DetectionMode, label: str) -> bool:
+        """Tecla de troca de modo de detecção"""
+        if self.detector.switch_mode(mode):
+            self.logger.info(f"Modo alterado para: {label}")
         return True
 
+    def _save_key(self) -> bool:
+        """Tecla S: salvar frame atual"""
+        self._save_current_frame()
+        return True
+
+    def _metrics_key(self) -> bool:
+        """Tecla M: mostrar métricas"""
+        self._print_metrics()
+        return True
+
+    def _heartbeat_key(self) -> bool:
+        """Tecla H: enviar heartbeat manual"""
+        if self.detector.send_heartbeat():
+            self.logger.info("Heartbeat enviado")
+        else:
+            self.logger.warning("Falha ao enviar heartbeat")
+        return True
+
+    # Tabela tecla -> ação (códigos calculados uma vez, na definição da classe).
+    # Cada ação retorna False se a aplicação deve encerrar.
+    _KEY_HANDLERS: Dict[int, Callable[["SmartParkApp"], bool]] = {
+        27: _quit_key,  # ESC
+        ord("q"): _quit_key,
+        ord("1"): lambda app: app._mode_key(DetectionMode.THRESHOLD, "Threshold"),
+        ord("s"): _save_key,
+        ord("m"): _metrics_key,
+        ord("h"): _heartbeat_key,
+    }
+
+    # Teclas registradas apenas se o YOLO estiver disponível
+    _YOLO_KEY_HANDLERS: Dict[int, Callable[["SmartParkApp"], bool]] = {
+        ord("2"): lambda app: app._mode_key(DetectionMode.YOLO, "YOLO"),
+        ord("3"): lambda app: app._mode_key(DetectionMode.HYBRID, "Hybrid"),
+    }
+
+    def _handle_key(self, key: int) -> bool:
+        """
+        Processa uma tecla pressionada
+
+        Args:
+            key: Código da tecla (já mascarado com 0xFF)
+
+        Returns:
+            False se a aplicação deve encerrar
+        """
+        handler = self._key_handlers.get(key)
+        return handler(self) if handler else True
+
+    def _copy_for_display(self, frame: np.ndarray) -> np.ndarray:
+        """
+        Copia o frame de debug para o próximo buffer de exibição do rodízio
+
+        Args:
+            frame: Frame de debug (pode ser um buffer reutilizado pelo detector)
+
+        Returns:
+            Buffer de exibição com o conteúdo do frame
+        """
+        slot = self._display_slot
+        self._display_slot = (slot + 1) % len(self._display_buffers)
+
+        buffer = self._display_buffers[slot]
+        if buffer is None or buffer.shape != frame.shape or buffer.dtype != frame.dtype:
+            buffer = np.empty_like(frame)
+            self._display_buffers[slot] = buffer
+        np.copyto(buffer, frame)
+        return buffer
+
     def _save_current_frame(self):
-        """Salva frame atual com debug"""
-        if (
-            hasattr(self, "_current_debug_frame")
-            and self._current_debug_frame is not None
-        ):
+        """Salva frame atual com debug (codificação JPEG na thread de gravação)"""
+        frame = self._last_debug_view
+        if frame is not None:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"debug_frame_{timestamp}.jpg"
-            cv2.imwrite(filename, self._current_debug_frame)
-            self.logger.info(f"Frame salvo: {filename}")
+            try:
+                # Cópia: o frame continua compartilhado com a fila de exibição
+                self._save_queue.put_nowait((filename, frame.copy()))
+            except queue.Full:
+                self.logger.warning("Fila de gravação cheia, frame descartado")
+
+    def _save_worker(self):
+        """Thread de gravação: codifica e grava os frames solicitados"""
+        while True:
+            item = self._save_queue.get()
+            if item is _END_OF_STREAM:
+                break
+
+            filename, frame = item
+            if cv2.imwrite(filename, frame):
+                self.logger.info(f"Frame salvo: {filename}")
+            else:
+                self.logger.error(f"Falha ao salvar frame: {filename}")
 
     def _print_metrics(self):
         """Imprime métricas no console"""
@@ -179,6 +398,29 @@ class SmartParkApp:
         print(f"FPS atual: {self.current_fps:.1f}")
         print(f"Tempo de execução: {stats['uptime']:.1f}s")
 
+        metrics = self._metrics
+        print("\nPipeline:")
+        print(
+            f"  Fila de leitura: {self._read_queue.qsize()}/{self._read_queue.maxsize} "
+            f"(máx. {metrics['read_q_hwm']})"
+        )
+        print(
+            f"  Fila de exibição: {self._display_queue.qsize()}/"
+            f"{self._display_queue.maxsize} (máx. {metrics['display_q_hwm']})"
+        )
+        print(
+            f"  Frames exibidos: {metrics['displayed_frames']}, "
+            f"descartados: {metrics['display_drops']}"
+        )
+        for stage, label in (
+            ("decode", "Decodificação"),
+            ("process", "Processamento"),
+            ("display", "Exibição"),
+        ):
+            print(f"  {label}: {self._latency_summary(self._latency_ms[stage])}")
+        if self.enable_api:
+            print(f"  Falhas de heartbeat: {metrics['heartbeat_failures']}")
+
         if "api" in stats:
             api_stats = stats["api"]
             print(f"\\nAPI Status: {api_stats['connection_status']}")
@@ -199,18 +441,67 @@ class SmartParkApp:
 
         print("========================\\n")
 
-    def _update_fps_counter(self):
-        """Atualiza contador de FPS"""
-        self.fps_counter += 1
+    @staticmethod
+    def _latency_summary(samples: deque) -> str:
+        """
+        Resume latências recentes de um estágio
+
+        Args:
+            samples: Latências recentes (ms)
+
+        Returns:
+            Texto com mediana e p95
+        """
+        if not samples:
+            return "sem amostras"
 
-        if self.fps_counter % 30 == 0:  # Atualizar a cada 30 frames
-            current_time = time.time()
-            elapsed = current_time - self.fps_start_time
+        values = list(samples)
+        median = statistics.median(values)
+        p95 = statistics.quantiles(values, n=20)[18] if len(values) > 1 else median
+        return f"mediana {median:.1f}ms, p95 {p95:.1f}ms"
+
+    def _sample_read_queue(self):
+        """
+        Amostra a ocupação da fila de leitura e aponta o gargalo do pipeline
+
+        A cada QUEUE_CHECK_INTERVAL frames, registra se a fila permaneceu
+        cheia (leitura mais rápida que a detecção) ou vazia (a leitura é o
+        gargalo) na maior parte da janela.
+        """
+        depth = self._read_queue.qsize()
+        if depth > self._metrics["read_q_hwm"]:
+            self._metrics["read_q_hwm"] = depth
+        self._queue_samples += 1
+        if depth >= self._read_queue.maxsize:
+            self._queue_full += 1
+        elif depth == 0:
+            self._queue_empty += 1
+
+        if self._queue_samples < QUEUE_CHECK_INTERVAL:
+            return
+
+        limit = QUEUE_SATURATION_RATIO * self._queue_samples
+        if self._queue_full >= limit:
+            self.logger.info(
+                "Fila de leitura cheia: detecção é o gargalo "
+                "(considere reduzir video.detection_width ou video.sample_fps)"
+            )
+        elif self._queue_empty >= limit:
+            decode_ms = self._metrics["decode_ns"] / max(
+                self._metrics["decoded_frames"], 1
+            ) / 1e6
+            self.logger.info(
+                f"Fila de leitura vazia: leitura é o gargalo ({decode_ms:.1f}ms/frame "
+                "de decodificação; considere decodificação por hardware)"
+            )
 
-            if elapsed > 0:
-                self.current_fps = 30 / elapsed
+        self._queue_samples = self._queue_full = self._queue_empty = 0
 
-            self.fps_start_time = current_time
+    @property
+    def current_fps(self) -> float:
+        """FPS médio de processamento desde o início do loop principal"""
+        elapsed_ns = time.monotonic_ns() - self._loop_start_ns
+        return self.frame_count * 1e9 / elapsed_ns if elapsed_ns else 0.0
 
     def run(self):
         """Executa o loop principal da aplicação"""
@@ -218,71 +509,120 @@ class SmartParkApp:
             # Configurar captura de vídeo
             self._setup_video_capture()
 
-            # Configurar janelas
-            if self.show_debug:
-                cv2.namedWindow("SmartPark Debug", cv2.WINDOW_NORMAL)
-                # Redimensionar janela para melhor visualização
-                cv2.resizeWindow("SmartPark Debug", 1200, 800)
-
-            if self.show_processed:
-                cv2.namedWindow("Processed Frame", cv2.WINDOW_NORMAL)
-                cv2.resizeWindow("Processed Frame", 800, 600)
-
             # Imprimir instruções
             self._print_instructions()
 
             self.running = True
             self.logger.info("Loop principal iniciado")
+            self._loop_start_ns = time.monotonic_ns()
 
             # Enviar heartbeat inicial
             if self.enable_api:
                 self.detector.send_heartbeat()
 
+            # Leitura em thread própria, com fila limitada (back-pressure)
+            self._reader_thread = threading.Thread(
+                target=self._reader_loop, name="smartpark-reader", daemon=True
+            )
+            self._reader_thread.start()
+
+            # Janelas, imshow e waitKey ficam todos na thread de exibição
+            if self.show_debug or self.show_processed:
+                self._display_thread = threading.Thread(
+                    target=self._display_loop, name="smartpark-display", daemon=True
+                )
+                self._display_thread.start()
+            else:
+                # Sem janelas: teclas lidas diretamente do terminal
+                self._start_stdin_reader()
+
+            # Buffer do frame anterior, devolvido ao pool com uma iteração de
+            # atraso (o detector mantém referência ao último frame)
+            previous_buffer = None
+
+            # Geração da fonte (incrementada pelo leitor a cada reinício do loop)
+            current_generation = 0
+
             while self.running:
-                ret, frame = self.video_capture.read()
+                # Teclas recebidas da thread de exibição
+                if not self._drain_key_queue():
+                    break
 
-                if not ret:
-                    if config.video.loop_video and not config.video.source.isdigit():
-                        # Reiniciar vídeo do início
-                        self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
-                        continue
-                    else:
-                        self.logger.info("Fim do vídeo atingido")
+                self._sample_read_queue()
+
+                try:
+                    item = self._read_queue.get(timeout=0.5)
+                except queue.Empty:
+                    if not self._reader_thread.is_alive():
                         break
+                    continue
+
+                if item is _END_OF_STREAM:
+                    self.logger.info("Fim do vídeo atingido")
+                    break
+
+                frame, buffer, generation = item
+
+                if generation != current_generation:
+                    # Vídeo reiniciado: descartar estado temporal dos detectores
+                    self.detector.reset_stream()
+                    current_generation = generation
 
                 # Processar frame
+                t0 = time.monotonic_ns()
                 results = self.detector.process_frame(frame)
+                self._latency_ms["process"].append((time.monotonic_ns() - t0) / 1e6)
                 self.frame_count += 1
+                now = time.monotonic()
 
-                # Atualizar FPS
-                self._update_fps_counter()
+                # Gerar frames de visualização (estado do detector lido nesta
+                # thread) apenas quando o orçamento de exibição permitir
+                draw = self._display_thread is not None and now >= self._next_draw
+                if draw:
+                    self._next_draw = now + self._draw_interval
 
-                # Gerar frame de debug
-                if self.show_debug:
+                debug_frame = None
+                if draw and self.show_debug:
                     debug_frame = self.detector.get_debug_frame(show_info=True)
-                    if debug_frame is not None:
-                        self._current_debug_frame = debug_frame
-                        cv2.imshow("SmartPark Debug", debug_frame)
 
                 # Mostrar frame processado (se aplicável e solicitado)
+                processed_frame = None
                 if (
-                    self.show_processed
+                    draw
+                    and self.show_processed
                     and self.detector.current_mode == DetectionMode.THRESHOLD
                 ):
                     threshold_detector = self.detector.detectors[
                         DetectionMode.THRESHOLD
                     ]
                     processed_frame = threshold_detector.get_processed_frame()
-                    if processed_frame is not None:
-                        cv2.imshow("Processed Frame", processed_frame)
 
-                # Processar entrada do teclado
-                if not self._handle_keyboard_input():
-                    break
+                # Exibição não deve atrasar a detecção: descartar se a fila estiver cheia
+                # (só esta thread enfileira: sem fila cheia, o put não falha e o
+                # próximo buffer de exibição do rodízio está livre)
+                if self._display_thread is not None and (
+                    debug_frame is not None or processed_frame is not None
+                ):
+                    if self._display_queue.full():
+                        self._metrics["display_drops"] += 1
+                    else:
+                        if debug_frame is not None:
+                            debug_frame = self._copy_for_display(debug_frame)
+                            self._last_debug_view = debug_frame
+                        self._display_queue.put_nowait((debug_frame, processed_frame))
+                        depth = self._display_queue.qsize()
+                        if depth > self._metrics["display_q_hwm"]:
+                            self._metrics["display_q_hwm"] = depth
 
                 # Heartbeat periódico (a cada 5 minutos)
-                if self.enable_api and time.time() % 300 < 1:
-                    self.detector.send_heartbeat()
+                if self.enable_api and now >= self._next_hb:
+                    if not self.detector.send_heartbeat():
+                        self._metrics["heartbeat_failures"] += 1
+                    self._next_hb = now + HEARTBEAT_INTERVAL
+
+                if previous_buffer is not None:
+                    self._frame_pool.put(previous_buffer)
+                previous_buffer = buffer
 
         except KeyboardInterrupt:
             self.logger.info("Interrompido pelo usuário (Ctrl+C)")
@@ -291,6 +631,234 @@ class SmartParkApp:
         finally:
             self._cleanup()
 
+    def _reader_loop(self):
+        """Thread de leitura: lê frames da câmera/arquivo para a fila de leitura"""
+        video_source = str(config.get("video.source", 0))
+        loop_video = config.get("video.loop_video", False) and not video_source.isdigit()
+        skip = self._compute_frame_skip()
+
+        use_pool = not self._frame_pool.empty()
+        generation = 0
+
+        try:
+            while not self._stop_event.is_set():
+                # Buffer livre do pool (aguarda o consumidor devolver um)
+                buffer = None
+                if use_pool:
+                    buffer = self._get_with_stop(self._frame_pool)
+                    if buffer is None:
+                        return
+
+                t0 = time.monotonic_ns()
+                ret, frame = self._grab_frame(skip, buffer)
+                elapsed_ns = time.monotonic_ns() - t0
+                self._metrics["decode_ns"] += elapsed_ns
+                self._metrics["decoded_frames"] += 1
+                self._latency_ms["decode"].append(elapsed_ns / 1e6)
+
+                if not ret:
+                    if buffer is not None:
+                        self._frame_pool.put(buffer)
+                    if loop_video:
+                        # Reiniciar vídeo do início; a fila continua cheia e a
+                        # thread principal não percebe o seek
+                        self.video_capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                        generation += 1
+                        self.logger.debug(f"Vídeo reiniciado (geração {generation})")
+                        continue
+                    break
+
+                if self._det_scale != 1.0:
+                    # O frame original não é usado após a redução: devolver o
+                    # buffer imediatamente
+                    frame = cv2.resize(
+                        frame,
+                        None,
+                        fx=self._det_scale,
+                        fy=self._det_scale,
+                        interpolation=cv2.INTER_AREA,
+                    )
+                    if buffer is not None:
+                        self._frame_pool.put(buffer)
+                        buffer = None
+
+                if not self._put_with_stop(
+                    self._read_queue, (frame, buffer, generation)
+                ):
+                    return
+
+        except Exception as e:
+            self.logger.error(f"Erro na leitura de vídeo: {e}")
+
+        self._put_with_stop(self._read_queue, _END_OF_STREAM)
+
+    def _compute_frame_skip(self) -> int:
+        """
+        Calcula quantos frames da fonte correspondem a um frame amostrado
+
+        Returns:
+            Passo de amostragem (1 = todos os frames)
+        """
+        sample_fps = config.get("video.sample_fps")
+        if not sample_fps:
+            return 1
+
+        source_fps = self.video_capture.get(cv2.CAP_PROP_FPS) or config.get("video.fps", 30)
+        skip = max(1, int(source_fps / sample_fps))
+
+        self.logger.info(
+            f"Amostragem: 1 a cada {skip} frames "
+            f"({source_fps / skip:.1f} FPS efetivos de {source_fps:.1f} FPS)"
+        )
+        return skip
+
+    def _grab_frame(self, skip: int, buffer: Optional[np.ndarray] = None):
+        """
+        Lê o próximo frame amostrado
+
+        Os frames descartados são apenas capturados com grab(), sem decodificação;
+        somente o frame amostrado é decodificado com retrieve().
+
+        Args:
+            skip: Passo de amostragem
+            buffer: Buffer pré-alocado para decodificar o frame (opcional)
+
+        Returns:
+            Tupla (sucesso, frame); o frame é o próprio buffer quando o
+            tamanho coincide
+        """
+        if skip == 1:
+            return self.video_capture.read(buffer)
+
+        for _ in range(skip - 1):
+            if not self.video_capture.grab():
+                return False, None
+
+        if not self.video_capture.grab():
+            return False, None
+
+        return self.video_capture.retrieve(buffer)
+
+    def _display_loop(self):
+        """Thread de exibição: janelas, imshow e leitura de teclado (waitKey)"""
+        # Configurar janelas
+        if self.show_debug:
+            cv2.namedWindow("SmartPark Debug", cv2.WINDOW_NORMAL)
+            # Redimensionar janela para melhor visualização
+            cv2.resizeWindow("SmartPark Debug", 1200, 800)
+
+        if self.show_processed:
+            cv2.namedWindow("Processed Frame", cv2.WINDOW_NORMAL)
+            cv2.resizeWindow("Processed Frame", 800, 600)
+
+        while not self._stop_event.is_set():
+            try:
+                debug_frame, processed_frame = self._display_queue.get_nowait()
+
+                t0 = time.monotonic_ns()
+                if debug_frame is not None:
+                    cv2.imshow("SmartPark Debug", debug_frame)
+                if processed_frame is not None:
+                    cv2.imshow("Processed Frame", processed_frame)
+                self._latency_ms["display"].append((time.monotonic_ns() - t0) / 1e6)
+                self._metrics["displayed_frames"] += 1
+                delay = 1
+            except queue.Empty:
+                # Nada para desenhar: esperar mais e ceder a CPU
+                delay = 5
+
+            # waitKey também processa os eventos das janelas
+            key = cv2.waitKey(delay) & 0xFF
+            if key != 0xFF:
+                self._key_queue.put(key)
+
+        cv2.destroyAllWindows()
+
+    def _start_stdin_reader(self):
+        """Inicia a thread de teclado do terminal (modo sem janelas)"""
+        if not TERMINAL_KEYS_AVAILABLE or not sys.stdin.isatty():
+            return
+
+        try:
+            fd = sys.stdin.fileno()
+            self._stdin_attrs = termios.tcgetattr(fd)
+            # Modo cbreak: teclas entregues sem Enter, Ctrl+C continua funcionando
+            tty.setcbreak(fd)
+        except (termios.error, OSError) as e:
+            self.logger.warning(f"Teclado do terminal indisponível: {e}")
+            self._stdin_attrs = None
+            return
+
+        self._stdin_thread = threading.Thread(
+            target=self._stdin_loop, name="smartpark-stdin", daemon=True
+        )
+        self._stdin_thread.start()
+
+    def _stdin_loop(self):
+        """Thread de teclado: lê teclas do terminal para a fila de teclas"""
+        fd = sys.stdin.fileno()
+
+        while not self._stop_event.is_set():
+            readable, _, _ = select.select([fd], [], [], 0.1)
+            if not readable:
+                continue
+
+            data = os.read(fd, 1)
+            if not data:  # EOF
+                break
+            self._key_queue.put(data[0])
+
+    def _restore_terminal(self):
+        """Restaura o modo original do terminal"""
+        if self._stdin_attrs is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, self._stdin_attrs)
+            self._stdin_attrs = None
+
+    def _put_with_stop(self, target_queue: "queue.Queue", item) -> bool:
+        """
+        Insere item na fila aguardando espaço, desistindo se a aplicação parar
+
+        Returns:
+            True se o item foi inserido
+        """
+        while not self._stop_event.is_set():
+            try:
+                target_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get_with_stop(self, source_queue: "queue.Queue"):
+        """
+        Retira item da fila aguardando disponibilidade, desistindo se a aplicação parar
+
+        Returns:
+            Item retirado ou None se a aplicação parou
+        """
+        while not self._stop_event.is_set():
+            try:
+                return source_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return None
+
+    def _drain_key_queue(self) -> bool:
+        """
+        Processa as teclas pendentes enviadas pela thread de exibição
+
+        Returns:
+            False se a aplicação deve encerrar
+        """
+        while True:
+            try:
+                key = self._key_queue.get_nowait()
+            except queue.Empty:
+                return True
+
+            if not self._handle_key(key):
+                return False
+
     def _print_instructions(self):
         """Imprime instruções de uso"""
         instructions = [
@@ -316,6 +884,17 @@ class SmartParkApp:
 
         self.running = False
 
+        # Parar threads do pipeline antes de liberar a captura
+        self._stop_event.set()
+        for thread in (self._reader_thread, self._display_thread, self._stdin_thread):
+            if thread is not None:
+                thread.join(timeout=2.0)
+        self._restore_terminal()
+
+        # Concluir gravações pendentes
+        self._save_queue.put(_END_OF_STREAM)
+        self._save_thread.join(timeout=5.0)
+
         # Fechar captura de vídeo
         if self.video_capture:
             self.video_capture.release()
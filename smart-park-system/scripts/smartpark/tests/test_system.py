@@ -4,57 +4,46 @@ SmartPark Computer Vision System - Test Suite
 Script para validação e teste do sistema completo.
 """
 
+import importlib
+import importlib.util
 import os
 import sys
+import threading
 import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Any
 
 # Adicionar diretório pai para imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+# Tempo máximo (s) aguardando o primeiro frame da câmera
+CAMERA_READ_TIMEOUT = 2.0
+
 
 def test_imports() -> Dict[str, bool]:
     """Testa importação de todos os módulos"""
     results = {}
 
-    # Módulos básicos
-    try:
-        import cv2
-
-        results["opencv"] = True
-    except ImportError:
-        results["opencv"] = False
-
-    try:
-        import yaml
+    # Módulos básicos e ultralytics (opcional): módulos ausentes são
+    # detectados por find_spec, sem iniciar a importação
+    for result_key, module_name in (
+        ("opencv", "cv2"),
+        ("yaml", "yaml"),
+        ("requests", "requests"),
+        ("numpy", "numpy"),
+        ("ultralytics", "ultralytics"),
+    ):
+        if importlib.util.find_spec(module_name) is None:
+            results[result_key] = False
+            continue
 
-        results["yaml"] = True
-    except ImportError:
-        results["yaml"] = False
-
-    try:
-        import requests
-
-        results["requests"] = True
-    except ImportError:
-        results["requests"] = False
-
-    try:
-        import numpy
-
-        results["numpy"] = True
-    except ImportError:
-        results["numpy"] = False
-
-    # Ultralytics (opcional)
-    try:
-        import ultralytics
-
-        results["ultralytics"] = True
-    except ImportError:
-        results["ultralytics"] = False
+        try:
+            importlib.import_module(module_name)
+            results[result_key] = True
+        except ImportError:
+            results[result_key] = False
 
     # Módulos do sistema
     try:
@@ -153,11 +142,36 @@ def test_camera() -> Dict[str, bool]:
     try:
         import cv2
 
-        # Testar webcam padrão
-        cap = cv2.VideoCapture(0)
+        cv2.setUseOptimized(True)
+
+        # Testar webcam padrão com o mesmo backend/formato do main.py:
+        # V4L2 evita a varredura de plugins do GStreamer no Linux
+        backend = cv2.CAP_V4L2 if sys.platform.startswith("linux") else cv2.CAP_ANY
+        cap = cv2.VideoCapture(0, backend)
+        if not cap.isOpened() and backend != cv2.CAP_ANY:
+            cap = cv2.VideoCapture(0)
 
         if cap.isOpened():
-            ret, frame = cap.read()
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+
+            # Leitura em thread separada: dispositivo sem resposta falha em
+            # CAMERA_READ_TIMEOUT em vez de bloquear a suíte
+            read_result = []
+            reader = threading.Thread(
+                target=lambda: read_result.append(cap.read()), daemon=True
+            )
+            reader.start()
+            reader.join(CAMERA_READ_TIMEOUT)
+            ret, frame = read_result[0] if read_result else (False, None)
+
+            if reader.is_alive():
+                # A leitura continua em andamento: não liberar o dispositivo
+                print(f"Câmera sem resposta em {CAMERA_READ_TIMEOUT:.0f}s")
+                results["camera_access"] = True
+                results["camera_read"] = False
+                return results
+
             if ret and frame is not None:
                 results["camera_access"] = True
                 results["camera_read"] = True
@@ -225,6 +239,118 @@ def test_detectors() -> Dict[str, bool]:
             print(f"Erro threshold detector: {e}")
             results["threshold_detector"] = False
 
+        # Threshold com frame reduzido na captura: mesmo status da resolução
+        # original (vaga ocupada com textura e vaga livre uniforme)
+        try:
+            import cv2
+            from dataclasses import replace
+
+            scale_frame = np.full((720, 1280, 3), 128, dtype=np.uint8)
+            yy, xx = np.mgrid[0:240, 0:360]
+            texture = ((yy // 24 + xx // 24) % 2) * 200 + 20
+            scale_frame[120:360, 120:480] = texture[..., None]
+            scale_zones = [
+                ParkingZone.from_config_zone({
+                    'id': 1,
+                    'name': 'OCUPADA',
+                    'coords': [[120, 120], [480, 120], [480, 360], [120, 360]],
+                    'enabled': True
+                }),
+                ParkingZone.from_config_zone({
+                    'id': 2,
+                    'name': 'LIVRE',
+                    'coords': [[700, 120], [1060, 120], [1060, 360], [700, 360]],
+                    'enabled': True
+                }),
+            ]
+
+            native = ThresholdDetector(threshold_config).process_frame(
+                scale_frame, scale_zones
+            )
+
+            scale = 1 / 3
+            scaled_detector = ThresholdDetector(threshold_config)
+            scaled_detector.set_detection_scale(scale)
+            scaled = scaled_detector.process_frame(
+                cv2.resize(
+                    scale_frame, None, fx=scale, fy=scale,
+                    interpolation=cv2.INTER_AREA
+                ),
+                [
+                    replace(
+                        zone,
+                        x=round(zone.x * scale),
+                        y=round(zone.y * scale),
+                        width=round(zone.width * scale),
+                        height=round(zone.height * scale),
+                    )
+                    for zone in scale_zones
+                ],
+            )
+
+            statuses = {code: r["status"] for code, r in native.items()}
+            results["threshold_detection_scale"] = (
+                statuses == {"OCUPADA": "OCCUPIED", "LIVRE": "FREE"}
+                and statuses == {code: r["status"] for code, r in scaled.items()}
+            )
+        except Exception as e:
+            print(f"Erro threshold com escala de detecção: {e}")
+            results["threshold_detection_scale"] = False
+
+        # Redução por área (kernel Numba) deve coincidir com cv2.INTER_AREA
+        try:
+            import cv2
+            from utils.image_utils import ImageProcessor
+
+            rng = np.random.default_rng(0)
+            resize_ok = True
+            for shape, scale in (((720, 1280, 3), 0.67), ((481, 643, 3), 0.5)):
+                resize_frame = rng.integers(0, 256, shape, dtype=np.uint8)
+                resized = ImageProcessor.resize_frame(resize_frame, scale)
+                expected = cv2.resize(
+                    resize_frame,
+                    (int(shape[1] * scale), int(shape[0] * scale)),
+                    interpolation=cv2.INTER_AREA
+                )
+                diff = np.abs(resized.astype(np.int16) - expected.astype(np.int16))
+                resize_ok = resize_ok and (
+                    resized.shape == expected.shape and int(diff.max()) <= 1
+                )
+            results["resize_area"] = resize_ok
+        except Exception as e:
+            print(f"Erro redimensionamento por área: {e}")
+            results["resize_area"] = False
+
+        # Blur mediano + dilatação fundidos devem ser idênticos ao OpenCV
+        try:
+            import cv2
+            from utils.image_utils import ImageProcessor, NUMBA_AVAILABLE
+
+            if NUMBA_AVAILABLE:
+                rng = np.random.default_rng(1)
+                mask = np.where(
+                    rng.random((241, 323)) < 0.3, 255, 0
+                ).astype(np.uint8)
+                fused_ok = True
+                for ksize, kernel_size, iterations in (
+                    (3, (3, 3), 1), (5, (3, 3), 2), (3, (5, 3), 1), (5, (4, 4), 1)
+                ):
+                    fused = ImageProcessor._median_dilate_fused(
+                        mask, 255, ksize, kernel_size, iterations
+                    )
+                    expected = cv2.dilate(
+                        cv2.medianBlur(mask, ksize),
+                        np.ones(kernel_size, np.uint8),
+                        iterations=iterations
+                    )
+                    fused_ok = fused_ok and np.array_equal(fused, expected)
+                results["median_dilate_fused"] = fused_ok
+            else:
+                print("Numba indisponível: blur mediano + dilatação fundidos não testados")
+        except Exception as e:
+            print(f"Erro blur mediano + dilatação fundidos: {e}")
+            results["median_dilate_fused"] = False
+
         # Testar YOLODetector (se disponível)
         try:
             from core.yolo_detector import YOLODetector
@@ -409,15 +535,39 @@ def main():
         ("Modelos", test_models),
     ]
 
-    for section_name, test_func in test_sections:
-        try:
-            results = test_func()
-            passed, total = print_results(section_name, results)
-            total_passed += passed
-            total_tests += total
-        except Exception as e:
-            print(f"\n❌ Erro na seção {section_name}: {e}")
-            traceback.print_exc()
+    # Runtime paralelo do Numba inicializado na thread principal: iniciado
+    # a partir de uma thread secundária, trava o encerramento do interpretador
+    try:
+        from core._zone_kernel import warmup
+        warmup()
+    except Exception:
+        pass
+
+    # Seções independentes executadas em paralelo; resultados exibidos na
+    # ordem original
+    section_results = {}
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = {
+            executor.submit(test_func): section_name
+            for section_name, test_func in test_sections
+        }
+        for future in as_completed(futures):
+            section_name = futures[future]
+            try:
+                section_results[section_name] = future.result()
+            except Exception as e:
+                section_results[section_name] = e
+
+    for section_name, _ in test_sections:
+        results = section_results[section_name]
+        if isinstance(results, Exception):
+            print(f"\n❌ Erro na seção {section_name}: {results}")
+            traceback.print_exception(results)
+            continue
+
+        passed, total = print_results(section_name, results)
+        total_passed += passed
+        total_tests += total
 
     # Resultado final
     print("\n" + "=" * 50)
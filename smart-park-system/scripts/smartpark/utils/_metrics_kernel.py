@@ -0,0 +1,124 @@
+"""
+Kernel do buffer circular de métricas do PerformanceTracker
+
+Implementação compilada com Numba (quando disponível) da gravação de uma
+detecção no buffer e do resumo da janela de tempo. O resumo percorre o
+buffer uma única vez em ordem cronológica, sem montar a cópia concatenada
+nem chamar uma redução NumPy por estatística. Sem Numba, o _MetricsRing usa
+as operações NumPy equivalentes.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True)
+    def ring_push(
+        values,
+        integers,
+        index,
+        timestamp_ns,
+        processing_time,
+        fps,
+        total_slots,
+        occupied_slots,
+        confidence_avg,
+        confidence_min,
+        confidence_max,
+    ):
+        """
+        Grava uma detecção na coluna index do buffer
+
+        Args:
+            values: Campos reais (5, N) float64
+            integers: Campos inteiros (3, N) int64
+            index: Coluna de escrita
+            timestamp_ns: Timestamp monotônico em nanossegundos
+            processing_time: Tempo de processamento em segundos
+            fps: FPS no momento da detecção
+            total_slots: Total de vagas
+            occupied_slots: Vagas ocupadas
+            confidence_avg: Confiança média
+            confidence_min: Confiança mínima
+            confidence_max: Confiança máxima
+        """
+        values[0, index] = processing_time
+        values[1, index] = fps
+        values[2, index] = confidence_avg
+        values[3, index] = confidence_min
+        values[4, index] = confidence_max
+        integers[0, index] = timestamp_ns
+        integers[1, index] = total_slots
+        integers[2, index] = occupied_slots
+
+    @njit(cache=True)
+    def ring_summarize(values, oldest, start, size):
+        """
+        Estatísticas das detecções da janela em uma única passada
+
+        Args:
+            values: Campos reais (5, N) float64
+            oldest: Coluna da detecção mais antiga mantida
+            start: Índice cronológico da primeira detecção da janela
+            size: Detecções mantidas no buffer (start < size)
+
+        Returns:
+            Tupla (detecções, soma/máx./mín. do tempo de processamento,
+            soma/máx./mín. do FPS, soma da confiança média)
+        """
+        capacity = values.shape[1]
+        index = (oldest + start) % capacity
+        time_sum = time_max = time_min = values[0, index]
+        fps_sum = fps_max = fps_min = values[1, index]
+        confidence_sum = values[2, index]
+
+        for i in range(start + 1, size):
+            index = (oldest + i) % capacity
+            processing_time = values[0, index]
+            fps = values[1, index]
+            time_sum += processing_time
+            fps_sum += fps
+            confidence_sum += values[2, index]
+            if processing_time > time_max:
+                time_max = processing_time
+            if processing_time < time_min:
+                time_min = processing_time
+            if fps > fps_max:
+                fps_max = fps
+            if fps < fps_min:
+                fps_min = fps
+
+        return (
+            size - start,
+            time_sum,
+            time_max,
+            time_min,
+            fps_sum,
+            fps_max,
+            fps_min,
+            confidence_sum,
+        )
+
+    def warmup():
+        """Compila os kernels antecipadamente (evita latência no primeiro frame)"""
+        values = np.zeros((5, 2), dtype=np.float64)
+        integers = np.zeros((3, 2), dtype=np.int64)
+        ring_push(values, integers, 0, 1, 0.0, 0.0, 1, 0, 0.0, 0.0, 0.0)
+        ring_summarize(values, 0, 0, 1)
+
+else:
+    ring_push = None
+    ring_summarize = None
+
+    def warmup():
+        """Sem Numba não há nada a compilar"""
+        return None
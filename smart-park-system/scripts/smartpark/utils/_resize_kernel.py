@@ -0,0 +1,115 @@
+"""
+Kernel de redimensionamento por área com tabela de pesos
+
+Para fatores de escala não inteiros (ex.: 0.67) o cv2.INTER_AREA cai no
+caminho genérico, bem mais lento que o de blocos usado em 1/2, 1/3... Aqui o
+redimensionamento é separável: para cada eixo, uma tabela pré-calculada
+(índice inicial + pesos de cobertura) define a contribuição de cada pixel
+de origem. O resultado difere do OpenCV em no máximo 1 nível de cinza.
+Sem Numba, o ImageProcessor usa apenas cv2.resize.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    njit = None
+    prange = range
+
+
+def area_table(src_len: int, dst_len: int):
+    """
+    Tabela de pesos do redimensionamento por área em um eixo
+
+    Args:
+        src_len: Tamanho do eixo na origem
+        dst_len: Tamanho do eixo no destino
+
+    Returns:
+        Tupla (índices iniciais (dst_len,) int32, pesos (dst_len, K) float32)
+    """
+    scale = src_len / dst_len
+    taps = int(np.ceil(scale)) + 1
+    starts = np.empty(dst_len, dtype=np.int32)
+    weights = np.zeros((dst_len, taps), dtype=np.float32)
+
+    for i in range(dst_len):
+        begin = i * scale
+        end = begin + scale
+        start = int(begin)
+        starts[i] = start
+        for k in range(taps):
+            if start + k >= src_len:
+                break
+            overlap = min(end, start + k + 1) - max(begin, start + k)
+            if overlap > 0:
+                weights[i, k] = overlap / scale
+
+    return starts, weights
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def resize_area_bgr(src, dst, rows, row_weights, cols, col_weights):
+        """
+        Redimensiona um frame BGR uint8 por área (passada vertical e horizontal)
+
+        Args:
+            src: Frame de origem (H, W, 3) uint8
+            dst: Frame de destino (h, w, 3) uint8
+            rows: Linha inicial de cada linha de destino
+            row_weights: Pesos das linhas de origem (h, Ky)
+            cols: Coluna inicial de cada coluna de destino
+            col_weights: Pesos das colunas de origem (w, Kx)
+        """
+        width = src.shape[1]
+        out_h, out_w = dst.shape[0], dst.shape[1]
+        taps_y = row_weights.shape[1]
+        taps_x = col_weights.shape[1]
+
+        for y in prange(out_h):
+            # Linha intermediária com margem: colunas além da borda têm peso 0
+            acc_row = np.zeros((width + taps_x) * 3, dtype=np.float32)
+            for k in range(taps_y):
+                weight = row_weights[y, k]
+                if weight == 0:
+                    continue
+                src_row = src[rows[y] + k].ravel()
+                for i in range(width * 3):
+                    acc_row[i] += weight * np.float32(src_row[i])
+
+            dst_row = dst[y]
+            for x in range(out_w):
+                base = cols[x] * 3
+                b = np.float32(0.5)
+                g = np.float32(0.5)
+                r = np.float32(0.5)
+                for k in range(taps_x):
+                    weight = col_weights[x, k]
+                    j = base + k * 3
+                    b += weight * acc_row[j]
+                    g += weight * acc_row[j + 1]
+                    r += weight * acc_row[j + 2]
+                dst_row[x, 0] = np.uint8(min(b, 255.0))
+                dst_row[x, 1] = np.uint8(min(g, 255.0))
+                dst_row[x, 2] = np.uint8(min(r, 255.0))
+
+    def warmup():
+        """Compila o kernel antecipadamente (evita latência no primeiro frame)"""
+        src = np.zeros((9, 9, 3), dtype=np.uint8)
+        dst = np.empty((6, 6, 3), dtype=np.uint8)
+        rows, row_weights = area_table(9, 6)
+        cols, col_weights = area_table(9, 6)
+        resize_area_bgr(src, dst, rows, row_weights, cols, col_weights)
+
+else:
+    resize_area_bgr = None
+
+    def warmup():
+        """Sem Numba não há nada a compilar"""
+        return None
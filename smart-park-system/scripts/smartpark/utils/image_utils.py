@@ -5,15 +5,47 @@ Este módulo fornece funções utilitárias para processamento de imagem
 compartilhadas entre os diferentes modos de detecção.
 """
 
+import threading
+import time
+from functools import lru_cache
+
 import cv2
 import numpy as np
 from typing import Tuple, List, Dict, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+from ._mask_kernel import NUMBA_AVAILABLE, median_dilate
+from ._resize_kernel import area_table, resize_area_bgr
 
-@dataclass
+# Parâmetros fixos de texto dos desenhos de depuração
+_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_TEXT_COLOR = (255, 255, 255)
+_FREE_COLOR = (0, 255, 0)
+_OCCUPIED_COLOR = (0, 0, 255)
+
+
+@lru_cache(maxsize=1024)
+def _format_confidence(confidence: float) -> str:
+    """Texto da confiança (os valores se repetem muito entre frames)"""
+    return f"{confidence:.2f}"
+
+
+@lru_cache(maxsize=8)
+def _dilate_kernel(rows: int, cols: int) -> np.ndarray:
+    """Elemento estruturante retangular da dilatação (somente leitura)"""
+    kernel = np.ones((rows, cols), np.uint8)
+    kernel.setflags(write=False)
+    return kernel
+
+
+@dataclass(slots=True, frozen=True)
 class ParkingZone:
-    """Representa uma zona de estacionamento"""
+    """
+    Representa uma zona de estacionamento
+
+    Imutável; os valores derivados da geometria são calculados uma única vez
+    na criação e lidos como atributos comuns.
+    """
 
     code: str
     id: int
@@ -22,6 +54,28 @@ class ParkingZone:
     width: int
     height: int
 
+    # Derivados (não entram no construtor nem na comparação)
+    x2: int = field(init=False, repr=False, compare=False)
+    y2: int = field(init=False, repr=False, compare=False)
+    coords: Tuple[int, int, int, int] = field(init=False, repr=False, compare=False)
+    bbox: Tuple[int, int, int, int] = field(init=False, repr=False, compare=False)
+    center: Tuple[int, int] = field(init=False, repr=False, compare=False)
+    area: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        x2 = self.x + self.width
+        y2 = self.y + self.height
+        object.__setattr__(self, "x2", x2)
+        object.__setattr__(self, "y2", y2)
+        # (x, y, width, height)
+        object.__setattr__(self, "coords", (self.x, self.y, self.width, self.height))
+        # (x1, y1, x2, y2)
+        object.__setattr__(self, "bbox", (self.x, self.y, x2, y2))
+        object.__setattr__(
+            self, "center", (self.x + self.width // 2, self.y + self.height // 2)
+        )
+        object.__setattr__(self, "area", self.width * self.height)
+
     @classmethod
     def from_config_zone(cls, zone_config: Dict[str, Any]) -> 'ParkingZone':
         """
@@ -54,25 +108,92 @@ class ParkingZone:
             height=height
         )
 
+
+@dataclass
+class ParkingZoneArray:
+    """
+    Zonas de estacionamento em estrutura de arrays (SoA)
+
+    Uma entrada por zona, na mesma ordem da lista de origem, para operações
+    em lote (contagem de pixels, pontos dentro das zonas, sobreposição).
+    """
+
+    codes: List[str]
+    ids: np.ndarray
+    x: np.ndarray
+    y: np.ndarray
+    w: np.ndarray
+    h: np.ndarray
+
+    @classmethod
+    def from_zones(cls, zones: List[ParkingZone]) -> 'ParkingZoneArray':
+        """
+        Cria a estrutura a partir de objetos ParkingZone
+
+        Args:
+            zones: Lista de zonas de estacionamento
+
+        Returns:
+            Instância de ParkingZoneArray
+        """
+        count = len(zones)
+        return cls(
+            codes=[zone.code for zone in zones],
+            ids=np.fromiter((zone.id for zone in zones), np.int64, count=count),
+            x=np.fromiter((zone.x for zone in zones), np.int32, count=count),
+            y=np.fromiter((zone.y for zone in zones), np.int32, count=count),
+            w=np.fromiter((zone.width for zone in zones), np.int32, count=count),
+            h=np.fromiter((zone.height for zone in zones), np.int32, count=count),
+        )
+
+    @classmethod
+    def from_config(cls, zones_config: List[Dict[str, Any]]) -> 'ParkingZoneArray':
+        """
+        Cria a estrutura a partir de configurações já convertidas
+        (chaves code, id, x, y, width, height)
+
+        Args:
+            zones_config: Lista de configurações de zonas
+
+        Returns:
+            Instância de ParkingZoneArray
+        """
+        count = len(zones_config)
+
+        def column(key, dtype):
+            return np.fromiter((zone[key] for zone in zones_config), dtype, count=count)
+
+        return cls(
+            codes=[zone["code"] for zone in zones_config],
+            ids=column("id", np.int64),
+            x=column("x", np.int32),
+            y=column("y", np.int32),
+            w=column("width", np.int32),
+            h=column("height", np.int32),
+        )
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
     @property
-    def coords(self) -> Tuple[int, int, int, int]:
-        """Retorna coordenadas como (x, y, width, height)"""
-        return (self.x, self.y, self.width, self.height)
+    def x2(self) -> np.ndarray:
+        """Coordenada x final de cada zona"""
+        return self.x + self.w
 
     @property
-    def bbox(self) -> Tuple[int, int, int, int]:
-        """Retorna bounding box como (x1, y1, x2, y2)"""
-        return (self.x, self.y, self.x + self.width, self.y + self.height)
+    def y2(self) -> np.ndarray:
+        """Coordenada y final de cada zona"""
+        return self.y + self.h
 
     @property
-    def center(self) -> Tuple[int, int]:
-        """Retorna centro da zona"""
-        return (self.x + self.width // 2, self.y + self.height // 2)
+    def bboxes(self) -> np.ndarray:
+        """Bounding boxes (N, 4) int32 como (x1, y1, x2, y2)"""
+        return np.stack((self.x, self.y, self.x2, self.y2), axis=1)
 
     @property
-    def area(self) -> int:
-        """Retorna área da zona"""
-        return self.width * self.height
+    def areas(self) -> np.ndarray:
+        """Área de cada zona"""
+        return self.w * self.h
 
 
 class ImageProcessor:
@@ -81,6 +202,19 @@ class ImageProcessor:
     pré-processamento e visualização.
     """
 
+    # Buffer intermediário do kernel fundido, um por thread
+    _scratch = threading.local()
+
+    # Tabelas de pesos do redimensionamento por área:
+    # (altura, largura, nova altura, nova largura) -> tabelas de linhas/colunas
+    _resize_luts: Dict[Tuple[int, int, int, int], Tuple[np.ndarray, ...]] = {}
+
+    # Dimensões de destino do resize_frame: (altura, largura, escala) -> (largura, altura)
+    _resize_shapes: Dict[Tuple[int, int, float], Tuple[int, int]] = {}
+
+    # Timestamp do resumo: (segundo, texto), refeito só quando o segundo muda
+    _timestamp_cache: Tuple[int, str] = (-1, "")
+
     @staticmethod
     def resize_frame(frame: np.ndarray, scale_factor: float = 0.67) -> np.ndarray:
         """
@@ -97,11 +231,128 @@ class ImageProcessor:
             return frame
 
         height, width = frame.shape[:2]
-        new_width = int(width * scale_factor)
-        new_height = int(height * scale_factor)
+        key = (height, width, scale_factor)
+        target = ImageProcessor._resize_shapes.get(key)
+        if target is None:
+            target = (int(width * scale_factor), int(height * scale_factor))
+            ImageProcessor._resize_shapes[key] = target
+        new_width, new_height = target
+
+        # Escalas como 0.9999 (vindas do YAML) não mudam o tamanho do frame
+        if new_width == width and new_height == height:
+            return frame
+
+        # Razões inteiras (1/2, 1/3...) já usam o caminho rápido de blocos do
+        # OpenCV; as demais reduções de frames BGR usam o kernel com tabela
+        if (
+            NUMBA_AVAILABLE
+            and scale_factor < 1.0
+            and isinstance(frame, np.ndarray)
+            and frame.ndim == 3
+            and frame.shape[2] == 3
+            and frame.dtype == np.uint8
+            and frame.flags.c_contiguous
+            and (width % new_width or height % new_height)
+        ):
+            return ImageProcessor._resize_area_lut(frame, new_width, new_height)
 
         return cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_AREA)
 
+    @staticmethod
+    def _resize_area_lut(frame: np.ndarray, new_width: int, new_height: int) -> np.ndarray:
+        """
+        Redimensiona por área com tabelas de pesos pré-calculadas (Numba)
+
+        Args:
+            frame: Frame BGR uint8 contíguo
+            new_width: Largura de destino
+            new_height: Altura de destino
+
+        Returns:
+            Frame redimensionado
+        """
+        height, width = frame.shape[:2]
+        key = (height, width, new_height, new_width)
+        lut = ImageProcessor._resize_luts.get(key)
+        if lut is None:
+            lut = area_table(height, new_height) + area_table(width, new_width)
+            ImageProcessor._resize_luts[key] = lut
+
+        resized = np.empty((new_height, new_width, 3), dtype=np.uint8)
+        resize_area_bgr(frame, resized, *lut)
+        return resized
+
+    @staticmethod
+    def compute_letterbox(
+        frame_shape: Tuple[int, ...], imgsz: int = 640, stride: int = 32
+    ) -> Dict[str, Any]:
+        """
+        Calcula parâmetros de letterbox (escala + padding) para um formato de frame
+
+        Segue a mesma regra do pré-processamento do ultralytics (retângulo mínimo
+        múltiplo do stride). Como depende apenas da resolução da câmera, pode ser
+        calculado uma vez e reutilizado em todos os frames.
+
+        Args:
+            frame_shape: Formato do frame original (altura, largura, ...)
+            imgsz: Tamanho de entrada do modelo
+            stride: Stride máximo do modelo
+
+        Returns:
+            Dicionário com ganho, tamanho redimensionado, paddings e formato final
+        """
+        height, width = frame_shape[:2]
+        gain = min(imgsz / height, imgsz / width)
+        new_width, new_height = round(width * gain), round(height * gain)
+
+        pad_w = ((imgsz - new_width) % stride) / 2
+        pad_h = ((imgsz - new_height) % stride) / 2
+        top, bottom = round(pad_h - 0.1), round(pad_h + 0.1)
+        left, right = round(pad_w - 0.1), round(pad_w + 0.1)
+
+        return {
+            "gain": gain,
+            "new_size": (new_width, new_height),
+            "top": top,
+            "bottom": bottom,
+            "left": left,
+            "right": right,
+            "out_shape": (new_height + top + bottom, new_width + left + right),
+        }
+
+    @staticmethod
+    def letterbox(
+        frame: np.ndarray, params: Dict[str, Any], out: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Redimensiona e aplica padding no frame conforme parâmetros de letterbox
+
+        Args:
+            frame: Frame original (BGR)
+            params: Parâmetros retornados por compute_letterbox
+            out: Buffer de saída pré-alocado (opcional)
+
+        Returns:
+            Frame com letterbox aplicado
+        """
+        new_width, new_height = params["new_size"]
+
+        if (frame.shape[1], frame.shape[0]) != (new_width, new_height):
+            frame = cv2.resize(
+                frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR
+            )
+
+        return cv2.copyMakeBorder(
+            frame,
+            params["top"],
+            params["bottom"],
+            params["left"],
+            params["right"],
+            cv2.BORDER_CONSTANT,
+            dst=out,
+            value=(114, 114, 114),
+        )
+
     @staticmethod
     def preprocess_for_threshold(
         frame: np.ndarray,
@@ -114,6 +365,7 @@ class ImageProcessor:
         median_blur_ksize: int = 5,
         dilate_kernel_size: Tuple[int, int] = (3, 3),
         dilate_iterations: int = 1,
+        fused_postprocess: bool = False,
     ) -> Tuple[np.ndarray, np.ndarray]:
         """
         Pré-processamento completo para detecção por threshold
@@ -129,6 +381,8 @@ class ImageProcessor:
             median_blur_ksize: Tamanho do kernel para blur mediano
             dilate_kernel_size: Tamanho do kernel para dilatação
             dilate_iterations: Número de iterações de dilatação
+            fused_postprocess: Blur mediano + dilatação em um único kernel
+                Numba (ignorado sem Numba ou com cv2.UMat)
 
         Returns:
             Tupla (frame_original_redimensionado, frame_processado)
@@ -149,15 +403,76 @@ class ImageProcessor:
             c_constant,
         )
 
+        if (
+            fused_postprocess
+            and NUMBA_AVAILABLE
+            and isinstance(threshold_frame, np.ndarray)
+        ):
+            return resized_frame, ImageProcessor._median_dilate_fused(
+                threshold_frame,
+                adaptive_threshold_max_val,
+                median_blur_ksize,
+                dilate_kernel_size,
+                dilate_iterations,
+            )
+
         # Filtro de blur mediano
         blurred_frame = cv2.medianBlur(threshold_frame, median_blur_ksize)
 
         # Dilatação
-        kernel = np.ones(dilate_kernel_size, np.uint8)
+        kernel = _dilate_kernel(*dilate_kernel_size)
         dilated_frame = cv2.dilate(blurred_frame, kernel, iterations=dilate_iterations)
 
         return resized_frame, dilated_frame
 
+    @staticmethod
+    def _median_dilate_fused(
+        threshold_frame: np.ndarray,
+        max_val: int,
+        median_blur_ksize: int,
+        dilate_kernel_size: Tuple[int, int],
+        dilate_iterations: int,
+    ) -> np.ndarray:
+        """
+        Blur mediano + dilatação da máscara binária no kernel Numba
+
+        Equivale a cv2.medianBlur seguido de cv2.dilate com kernel retangular
+        (âncora central); iterações da dilatação ampliam o alcance do kernel.
+
+        Args:
+            threshold_frame: Saída do threshold adaptativo (0/max_val)
+            max_val: Valor dos pixels ativos
+            median_blur_ksize: Tamanho do kernel para blur mediano
+            dilate_kernel_size: Tamanho do kernel para dilatação (linhas, colunas)
+            dilate_iterations: Número de iterações de dilatação
+
+        Returns:
+            Máscara processada (nova a cada chamada)
+        """
+        scratch = ImageProcessor._scratch
+        mid = getattr(scratch, "mid", None)
+        if mid is None or mid.shape != threshold_frame.shape:
+            mid = np.empty_like(threshold_frame)
+            scratch.mid = mid
+
+        # A saída não é reaproveitada: detectores guardam a última máscara
+        dst = np.empty_like(threshold_frame)
+
+        rows, cols = dilate_kernel_size
+        anchor_y, anchor_x = rows // 2, cols // 2
+        median_dilate(
+            threshold_frame,
+            mid,
+            dst,
+            max_val,
+            median_blur_ksize,
+            dilate_iterations * anchor_y,
+            dilate_iterations * (rows - 1 - anchor_y),
+            dilate_iterations * anchor_x,
+            dilate_iterations * (cols - 1 - anchor_x),
+        )
+        return dst
+
     @staticmethod
     def count_white_pixels(processed_frame: np.ndarray, zone: ParkingZone) -> int:
         """
@@ -174,12 +489,76 @@ class ImageProcessor:
         roi = processed_frame[y : y + h, x : x + w]
         return cv2.countNonZero(roi)
 
+    @staticmethod
+    def count_white_pixels_batch(
+        processed_frame: np.ndarray, boxes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Conta pixels brancos de todas as zonas de uma vez
+
+        Se as zonas somadas cobrem ao menos o frame inteiro (muitas zonas ou
+        sobrepostas), usa uma imagem integral: uma passada no frame e quatro
+        leituras por zona. Caso contrário, contar só os ROIs lê menos memória.
+
+        Args:
+            processed_frame: Frame processado (binário)
+            boxes: Bounding boxes (N, 4) das zonas (ParkingZoneArray.bboxes)
+
+        Returns:
+            Array (N,) com o número de pixels brancos por zona
+        """
+        height, width = processed_frame.shape[:2]
+        x1 = np.clip(boxes[:, 0], 0, width)
+        y1 = np.clip(boxes[:, 1], 0, height)
+        x2 = np.clip(boxes[:, 2], x1, width)
+        y2 = np.clip(boxes[:, 3], y1, height)
+
+        if int(((x2 - x1) * (y2 - y1)).sum(dtype=np.int64)) < height * width:
+            return np.array(
+                [
+                    cv2.countNonZero(processed_frame[top:bottom, left:right])
+                    for left, top, right, bottom in zip(
+                        x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()
+                    )
+                ],
+                dtype=np.int64,
+            )
+
+        # Máscara 0/1 mantém a soma em int32 mesmo em resoluções altas
+        ones = cv2.threshold(processed_frame, 0, 1, cv2.THRESH_BINARY)[1]
+        sat = cv2.integral(ones, sdepth=cv2.CV_32S)
+        return (
+            sat[y2, x2].astype(np.int64) - sat[y1, x2] - sat[y2, x1] + sat[y1, x1]
+        )
+
+    @staticmethod
+    def _drawing_target(
+        frame: np.ndarray, copy: bool, out: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Escolhe onde desenhar: buffer do chamador, cópia ou o próprio frame
+
+        Args:
+            frame: Frame de entrada
+            copy: Se deve copiar o frame quando não há buffer
+            out: Buffer persistente do chamador (opcional)
+
+        Returns:
+            Frame onde as anotações serão desenhadas
+        """
+        if out is not None:
+            np.copyto(out, frame)
+            return out
+        return frame.copy() if copy else frame
+
     @staticmethod
     def draw_parking_zones(
         frame: np.ndarray,
         zones: List[ParkingZone],
         statuses: Dict[str, Dict[str, Any]] = None,
         show_pixel_count: bool = False,
+        copy: bool = True,
+        out: np.ndarray = None,
     ) -> np.ndarray:
         """
         Desenha zonas de estacionamento no frame
@@ -189,15 +568,17 @@ class ImageProcessor:
             zones: Lista de zonas de estacionamento
             statuses: Dicionário com status de cada zona
             show_pixel_count: Se deve mostrar contagem de pixels
+            copy: Se False, desenha diretamente no frame recebido
+            out: Buffer persistente (mesmo formato) que recebe a cópia do frame
 
         Returns:
             Frame com zonas desenhadas
         """
-        result_frame = frame.copy()
+        result_frame = ImageProcessor._drawing_target(frame, copy, out)
 
         for zone in zones:
             # Definir cor baseada no status
-            color = (0, 255, 0)  # Verde padrão (livre)
+            color = _FREE_COLOR  # Verde padrão (livre)
             thickness = 2
 
             if statuses and zone.code in statuses:
@@ -206,16 +587,16 @@ class ImageProcessor:
                 confidence = status_info.get("confidence", 0.0)
 
                 if status == "OCCUPIED":
-                    color = (0, 0, 255)  # Vermelho para ocupado
+                    color = _OCCUPIED_COLOR  # Vermelho para ocupado
                     thickness = 3
                 elif status == "FREE":
-                    color = (0, 255, 0)  # Verde para livre
+                    color = _FREE_COLOR  # Verde para livre
 
                 # Texto com informações
                 text_lines = [zone.code, status]
 
                 if "confidence" in status_info:
-                    text_lines.append(f"{confidence:.2f}")
+                    text_lines.append(_format_confidence(confidence))
 
                 if show_pixel_count and "pixel_count" in status_info:
                     text_lines.append(f"px:{status_info['pixel_count']}")
@@ -227,9 +608,9 @@ class ImageProcessor:
                         result_frame,
                         text,
                         (zone.x, text_y - (i * 20)),
-                        cv2.FONT_HERSHEY_SIMPLEX,
+                        _FONT,
                         0.5,
-                        (255, 255, 255),
+                        _TEXT_COLOR,
                         1,
                     )
 
@@ -248,6 +629,8 @@ class ImageProcessor:
         mode: str = "Unknown",
         fps: float = 0.0,
         processing_time: float = 0.0,
+        copy: bool = True,
+        out: np.ndarray = None,
     ) -> np.ndarray:
         """
         Desenha informações de resumo no frame
@@ -260,25 +643,25 @@ class ImageProcessor:
             mode: Modo de detecção atual
             fps: FPS atual
             processing_time: Tempo de processamento
+            copy: Se False, desenha diretamente no frame recebido
+            out: Buffer persistente (mesmo formato) que recebe a cópia do frame
 
         Returns:
             Frame com informações de resumo
         """
-        result_frame = frame.copy()
+        result_frame = ImageProcessor._drawing_target(frame, copy, out)
         height, width = result_frame.shape[:2]
 
-        # Fundo para as informações
-        info_bg = (50, 50, 50, 180)  # Semi-transparente
-        overlay = result_frame.copy()
-
-        # Área do cabeçalho
-        cv2.rectangle(overlay, (10, 10), (width - 10, 120), info_bg[:3], -1)
-        cv2.addWeighted(overlay, 0.7, result_frame, 0.3, 0, result_frame)
+        # Fundo semi-transparente do cabeçalho: mistura só a região do
+        # retângulo (fora dela a mistura com o próprio frame não muda nada)
+        header = result_frame[10:121, 10 : width - 9]
+        if header.size:
+            cv2.addWeighted(header, 0.3, header, 0.0, 0.7 * 50, dst=header)
 
         # Textos informativos
-        font = cv2.FONT_HERSHEY_SIMPLEX
+        font = _FONT
         font_scale = 0.7
-        color = (255, 255, 255)
+        color = _TEXT_COLOR
         thickness = 2
 
         # Linha 1: Status das vagas
@@ -292,13 +675,26 @@ class ImageProcessor:
         cv2.putText(result_frame, mode_text, (20, 60), font, 0.5, color, 1)
 
         # Linha 3: Timestamp
-        from datetime import datetime
-
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        timestamp = ImageProcessor._current_timestamp()
         cv2.putText(result_frame, timestamp, (20, 85), font, 0.5, color, 1)
 
         return result_frame
 
+    @staticmethod
+    def _current_timestamp() -> str:
+        """
+        Data/hora atual (resolução de segundos) para o resumo
+
+        Returns:
+            String no formato AAAA-MM-DD HH:MM:SS
+        """
+        second = int(time.time())
+        cached_second, text = ImageProcessor._timestamp_cache
+        if second != cached_second:
+            text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+            ImageProcessor._timestamp_cache = (second, text)
+        return text
+
     @staticmethod
     def create_parking_zones_from_config(
         zones_config: List[Dict[str, Any]],
@@ -306,25 +702,27 @@ class ImageProcessor:
         """
         Cria objetos ParkingZone a partir de configuração
 
+        As colunas são lidas uma única vez em um ParkingZoneArray; os objetos
+        ParkingZone são montados a partir dele.
+
         Args:
             zones_config: Lista de configurações de zonas
 
         Returns:
             Lista de objetos ParkingZone
         """
-        zones = []
-        for zone_config in zones_config:
-            zone = ParkingZone(
-                code=zone_config["code"],
-                id=zone_config["id"],
-                x=zone_config["x"],
-                y=zone_config["y"],
-                width=zone_config["width"],
-                height=zone_config["height"],
+        array = ParkingZoneArray.from_config(zones_config)
+        return [
+            ParkingZone(code=code, id=zone_id, x=x, y=y, width=w, height=h)
+            for code, zone_id, x, y, w, h in zip(
+                array.codes,
+                array.ids.tolist(),
+                array.x.tolist(),
+                array.y.tolist(),
+                array.w.tolist(),
+                array.h.tolist(),
             )
-            zones.append(zone)
-
-        return zones
+        ]
 
     @staticmethod
     def calculate_overlap_ratio(
@@ -360,6 +758,41 @@ class ImageProcessor:
 
         return intersection_area / union_area
 
+    @staticmethod
+    def overlap_matrix(
+        boxes_a: np.ndarray, boxes_b: np.ndarray, areas_a: np.ndarray = None
+    ) -> np.ndarray:
+        """
+        Razão de sobreposição (IoU) entre todos os pares de caixas
+
+        Mesmo critério de calculate_overlap_ratio, calculado em lote.
+
+        Args:
+            boxes_a: Caixas (M, 4) como (x1, y1, x2, y2)
+            boxes_b: Caixas (N, 4) como (x1, y1, x2, y2)
+            areas_a: Áreas pré-calculadas de boxes_a (opcional)
+
+        Returns:
+            Matriz (M, N) float32 com a sobreposição de cada par (0.0 a 1.0)
+        """
+        a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+        b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+
+        inter_w = np.minimum(a[:, None, 2], b[None, :, 2]) - np.maximum(
+            a[:, None, 0], b[None, :, 0]
+        )
+        inter_h = np.minimum(a[:, None, 3], b[None, :, 3]) - np.maximum(
+            a[:, None, 1], b[None, :, 1]
+        )
+        inter = np.clip(inter_w, 0, None) * np.clip(inter_h, 0, None)
+
+        if areas_a is None:
+            areas_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+        areas_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+        union = areas_a[:, None] + areas_b[None, :] - inter
+
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union != 0)
+
     @staticmethod
     def is_point_in_zone(point: Tuple[int, int], zone: ParkingZone) -> bool:
         """
@@ -376,3 +809,24 @@ class ImageProcessor:
         return (
             zone.x <= x <= zone.x + zone.width and zone.y <= y <= zone.y + zone.height
         )
+
+    @staticmethod
+    def is_point_in_zone_batch(
+        points: np.ndarray, zones: ParkingZoneArray
+    ) -> np.ndarray:
+        """
+        Verifica quais pontos estão dentro de quais zonas (mesmo critério de
+        is_point_in_zone, bordas inclusas)
+
+        Args:
+            points: Pontos (P, 2) como (x, y)
+            zones: Zonas em estrutura de arrays
+
+        Returns:
+            Array booleano (P, Z)
+        """
+        points = np.asarray(points).reshape(-1, 2)
+        px, py = points[:, 0, None], points[:, 1, None]
+        return (
+            (zones.x <= px) & (px <= zones.x2) & (zones.y <= py) & (py <= zones.y2)
+        )
@@ -5,14 +5,41 @@ Fornece logging centralizado e estruturado para todos os módulos do sistema,
 com suporte a múltiplos arquivos de log e métricas específicas por modo de detecção.
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 import sys
 import json
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, ClassVar
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Listeners que escrevem os logs (arquivo/console) em threads de fundo
+_listeners: List[logging.handlers.QueueListener] = []
+_listeners_lock = threading.Lock()
+
+
+def _stop_listeners():
+    """Esvazia as filas e encerra os listeners"""
+    with _listeners_lock:
+        while _listeners:
+            _listeners.pop().stop()
+
+
+# Registrado após o logging.shutdown (atexit é LIFO): os listeners esvaziam
+# as filas antes de os handlers serem fechados
+atexit.register(_stop_listeners)
 
 
 class ColoredFormatter(logging.Formatter):
@@ -36,11 +63,47 @@ class ColoredFormatter(logging.Formatter):
 
 
 class JSONFormatter(logging.Formatter):
-    """Formatter para logs estruturados em JSON"""
+    """Formatter para logs estruturados em JSON (orjson quando disponível)"""
+
+    if ORJSON_AVAILABLE:
+        _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Data/hora ISO do último segundo formatado: (segundo, "AAAA-MM-DDTHH:MM:SS")
+        self._ts_cache = (None, "")
+
+    def _timestamp(self, created: float) -> str:
+        """
+        Timestamp ISO 8601 local com microssegundos, sem criar um datetime
+
+        Args:
+            created: Instante do registro (record.created)
+
+        Returns:
+            String no formato AAAA-MM-DDTHH:MM:SS.ffffff
+        """
+        second = int(created)
+        cached_second, prefix = self._ts_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(second))
+            self._ts_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1e6):06d}"
+
+    def _dumps(self, log_data: Dict[str, Any]) -> str:
+        """Serializa o registro; tipos que o orjson rejeita caem no json"""
+        if ORJSON_AVAILABLE:
+            try:
+                return orjson.dumps(log_data, option=self._ORJSON_OPTIONS).decode(
+                    "utf-8"
+                )
+            except TypeError:
+                pass
+        return json.dumps(log_data, ensure_ascii=False)
 
     def format(self, record):
         log_data = {
-            "timestamp": datetime.fromtimestamp(record.created).isoformat(),
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "module": record.name,
             "message": record.getMessage(),
@@ -52,7 +115,7 @@ class JSONFormatter(logging.Formatter):
         if hasattr(record, "extra_data"):
             log_data.update(record.extra_data)
 
-        return json.dumps(log_data, ensure_ascii=False)
+        return self._dumps(log_data)
 
 
 def setup_logger(
@@ -67,6 +130,10 @@ def setup_logger(
     """
     Configura um logger com handlers para arquivo e console.
 
+    O logger recebe apenas um QueueHandler: formatação e escrita (arquivo
+    com rotação e console) ficam a cargo de um QueueListener em thread de
+    fundo, sem E/S síncrona na thread que registra a mensagem.
+
     Args:
         name: Nome do logger
         log_level: Nível de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
@@ -114,13 +181,24 @@ def setup_logger(
         log_file, maxBytes=max_file_size, backupCount=backup_count, encoding="utf-8"
     )
     file_handler.setFormatter(file_formatter)
-    logger.addHandler(file_handler)
+    handlers = [file_handler]
 
     # Configura handler do console
     if console_output:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setFormatter(console_formatter)
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    # Escrita assíncrona: o logger só enfileira os registros
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    with _listeners_lock:
+        _listeners.append(listener)
 
     logger.info(f"Logger '{name}' inicializado com nível {log_level}")
     logger.info(f"Arquivo de log: {log_file}")
@@ -147,6 +225,26 @@ class SmartParkLogger:
     tipos de logs (geral, métricas, API, performance).
     """
 
+    # Instância compartilhada pelo processo (ver get_default)
+    _instance: ClassVar[Optional["SmartParkLogger"]] = None
+    _instance_lock: ClassVar[threading.Lock] = threading.Lock()
+
+    @classmethod
+    def get_default(cls) -> "SmartParkLogger":
+        """
+        Obtém a instância compartilhada (diretório de logs padrão)
+
+        Returns:
+            SmartParkLogger criado na primeira chamada e reutilizado depois
+        """
+        instance = cls._instance
+        if instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                instance = cls._instance
+        return instance
+
     def __init__(self, log_dir: Optional[str] = None):
         """
         Inicializa o sistema de logging SmartPark
@@ -187,17 +285,9 @@ class SmartParkLogger:
             processing_time: Tempo de processamento
             **kwargs: Métricas adicionais
         """
-        metrics_data = {
-            "type": "detection_metrics",
-            "mode": mode,
-            "fps": fps,
-            "accuracy": accuracy,
-            "processing_time": processing_time,
-            **kwargs,
-        }
-
-        # Log apenas no arquivo para análise posterior
-        # self.metrics_logger.info("", extra={"extra_data": metrics_data})
+        # Emissão desativada: chamado a cada frame, não monta o registro à toa
+        # (histórico fica no PerformanceTracker)
+        return None
 
     def log_api_event(
         self,
@@ -247,16 +337,8 @@ class SmartParkLogger:
             duration: Duração em segundos
             **kwargs: Métricas adicionais
         """
-        performance_data = {
-            "type": "performance",
-            "component": component,
-            "operation": operation,
-            "duration": duration,
-            **kwargs,
-        }
-
-        # Log apenas no arquivo para análise posterior
-        # self.performance_logger.info("", extra={"extra_data": performance_data})
+        # Emissão desativada (ver log_detection_metrics)
+        return None
 
     def log_model_performance(
         self, model_name: str, confidence: float, detections: int, **kwargs
@@ -270,16 +352,8 @@ class SmartParkLogger:
             detections: Número de detecções
             **kwargs: Métricas adicionais
         """
-        model_data = {
-            "type": "model_performance",
-            "model_name": model_name,
-            "confidence": confidence,
-            "detections": detections,
-            **kwargs,
-        }
-
-        # Log apenas no arquivo para análise posterior
-        # self.metrics_logger.info("", extra={"extra_data": model_data})
+        # Emissão desativada (ver log_detection_metrics)
+        return None
 
     def get_logger(self, component: str = None) -> logging.Logger:
         """
@@ -299,6 +373,9 @@ class SmartParkLogger:
 class LoggerMixin:
     """Mixin para adicionar capacidades de logging a qualquer classe"""
 
+    # Logger de cada classe, compartilhado entre as instâncias
+    _class_loggers: ClassVar[Dict[type, logging.Logger]] = {}
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._logger = None
@@ -308,14 +385,19 @@ class LoggerMixin:
     def logger(self) -> logging.Logger:
         """Obtém logger para esta classe"""
         if self._logger is None:
-            self._logger = get_logger(f"smartpark.{self.__class__.__name__}")
+            cls = self.__class__
+            logger = LoggerMixin._class_loggers.get(cls)
+            if logger is None:
+                logger = get_logger(f"smartpark.{cls.__name__}")
+                LoggerMixin._class_loggers[cls] = logger
+            self._logger = logger
         return self._logger
 
     @property
     def smartpark_logger(self) -> SmartParkLogger:
         """Obtém logger SmartPark especializado"""
         if self._smartpark_logger is None:
-            self._smartpark_logger = SmartParkLogger()
+            self._smartpark_logger = SmartParkLogger.get_default()
         return self._smartpark_logger
 
 
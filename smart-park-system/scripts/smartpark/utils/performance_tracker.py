@@ -5,19 +5,46 @@ Este módulo fornece ferramentas para monitorar e comparar a performance
 dos diferentes modos de detecção do sistema.
 """
 
+import copy
 import time
 import json
-import statistics
+import math
+import threading
 from collections import defaultdict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Any, NamedTuple, Optional, Tuple, TypeVar
+from dataclasses import dataclass, field
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from ._metrics_kernel import NUMBA_AVAILABLE, ring_push, ring_summarize
+from ._metrics_kernel import warmup as _warmup_metrics_kernel
 from .logger import LoggerMixin
 
+# Linhas do buffer circular de métricas de cada modo (valores reais e inteiros)
+(
+    _RING_PROCESSING_TIME,
+    _RING_FPS,
+    _RING_CONFIDENCE,
+    _RING_CONFIDENCE_MIN,
+    _RING_CONFIDENCE_MAX,
+) = range(5)
+_RING_TIMESTAMP_NS, _RING_TOTAL_SLOTS, _RING_OCCUPIED_SLOTS = range(3)
 
-@dataclass
+_NS_PER_SECOND = 1_000_000_000
+
+_T = TypeVar("_T")
+
+
+@dataclass(slots=True)
 class DetectionMetrics:
     """Métricas de uma detecção específica"""
 
@@ -31,11 +58,71 @@ class DetectionMetrics:
     confidence_avg: float
     confidence_min: float
     confidence_max: float
-    additional_data: Dict[str, Any] = None
+    # None quando o modo não enviou dados adicionais (sem dict vazio por frame)
+    additional_data: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Converte para dicionário"""
-        return asdict(self)
+        """
+        Converte para dicionário (formato de exportação, sem reflexão)
+
+        Sem dados adicionais, additional_data sai como {} (None só em memória)
+        """
+        return {
+            "timestamp": self.timestamp,
+            "mode": self.mode,
+            "processing_time": self.processing_time,
+            "fps": self.fps,
+            "total_slots": self.total_slots,
+            "occupied_slots": self.occupied_slots,
+            "free_slots": self.free_slots,
+            "confidence_avg": self.confidence_avg,
+            "confidence_min": self.confidence_min,
+            "confidence_max": self.confidence_max,
+            "additional_data": (
+                copy.deepcopy(self.additional_data)
+                if self.additional_data is not None
+                else {}
+            ),
+        }
+
+
+def _json_default(obj: Any) -> Any:
+    """Conversão de tipos não nativos (hook default do orjson e do json)"""
+    if isinstance(obj, DetectionMetrics):
+        return obj.to_dict()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# Extensões exportadas como JSON delimitado por linhas (um objeto por linha)
+_NDJSON_SUFFIXES = (".ndjson", ".jsonl")
+
+# DetectionMetrics passam pelo _json_default (to_dict) também no orjson, para
+# manter o mesmo formato do fallback json
+_ORJSON_OPTIONS = (
+    (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATACLASS)
+    if ORJSON_AVAILABLE
+    else 0
+)
+
+
+def _json_line(obj: Any) -> bytes:
+    """Serializa um objeto em uma linha JSON compacta (com quebra de linha)"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(
+                obj,
+                default=_json_default,
+                option=_ORJSON_OPTIONS | orjson.OPT_APPEND_NEWLINE,
+            )
+        except TypeError:
+            # Dados adicionais com tipos que o orjson não serializa
+            pass
+    line = json.dumps(obj, ensure_ascii=False, default=_json_default)
+    return line.encode("utf-8") + b"\n"
 
 
 @dataclass
@@ -52,12 +139,303 @@ class ModeComparison:
     uptime_percentage: float
 
 
+class _WindowStats(NamedTuple):
+    """Agregados das detecções de uma janela do buffer (ver summarize)"""
+
+    count: int
+    time_sum: float
+    time_max: float
+    time_min: float
+    fps_sum: float
+    fps_max: float
+    fps_min: float
+    confidence_sum: float
+
+
+class _MetricsRing:
+    """
+    Histórico de métricas de um modo em buffer circular de arrays (SoA)
+
+    Os campos numéricos ficam em arrays NumPy contíguos (uma linha por
+    campo); os DetectionMetrics só são montados quando solicitados.
+
+    Escrita por um produtor de cada vez (lock do modo no PerformanceTracker);
+    leituras sem lock via read(), no estilo seqlock: `sequence` fica ímpar
+    durante a escrita e a leitura é refeita se mudar no meio.
+    """
+
+    def __init__(self, mode: str, capacity: int, clock_origin: Tuple[int, float]):
+        """
+        Args:
+            mode: Nome do modo
+            capacity: Máximo de detecções mantidas
+            clock_origin: (time.monotonic_ns(), time.time()) de um mesmo instante,
+                para converter os timestamps monotônicos em horário real
+        """
+        self.mode = mode
+        self.capacity = capacity
+        self.clock_origin = clock_origin
+        self.values = np.empty((5, capacity), dtype=np.float64)
+        self.integers = np.empty((3, capacity), dtype=np.int64)
+        self.additional_data: List[Optional[Dict[str, Any]]] = [None] * capacity
+        # Total de detecções já registradas (posição de escrita = count % capacity)
+        self.count = 0
+        self.sequence = 0
+
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+
+    def push(
+        self,
+        timestamp_ns: int,
+        processing_time: float,
+        fps: float,
+        total_slots: int,
+        occupied_slots: int,
+        confidence_avg: float,
+        confidence_min: float,
+        confidence_max: float,
+        additional_data: Optional[Dict[str, Any]] = None,
+    ):
+        """Registra uma detecção, sobrescrevendo a mais antiga se cheio"""
+        self.sequence += 1
+        index = self.count % self.capacity
+        if ring_push is not None:
+            # Tipos fixos: uma única especialização compilada do kernel
+            ring_push(
+                self.values,
+                self.integers,
+                index,
+                timestamp_ns,
+                float(processing_time),
+                float(fps),
+                total_slots,
+                occupied_slots,
+                float(confidence_avg),
+                float(confidence_min),
+                float(confidence_max),
+            )
+        else:
+            self.values[:, index] = (
+                processing_time,
+                fps,
+                confidence_avg,
+                confidence_min,
+                confidence_max,
+            )
+            self.integers[:, index] = (timestamp_ns, total_slots, occupied_slots)
+        self.additional_data[index] = additional_data or None
+        self.count += 1
+        self.sequence += 1
+
+    def read(self, reader: Callable[[], _T]) -> _T:
+        """
+        Executa uma leitura consistente do buffer sem bloquear o produtor
+
+        Args:
+            reader: Função que lê o buffer e devolve valores já copiados
+                (não views dos arrays)
+
+        Returns:
+            Resultado de uma execução de reader sem escrita concorrente
+        """
+        while True:
+            sequence = self.sequence
+            if sequence & 1:
+                # Escrita em andamento: cede a vez para o produtor terminar
+                time.sleep(0)
+                continue
+            result = reader()
+            if self.sequence == sequence:
+                return result
+
+    def _ordered(self, array: np.ndarray) -> np.ndarray:
+        """Colunas do buffer em ordem cronológica de registro"""
+        if self.count <= self.capacity:
+            return array[..., : self.count]
+
+        # Buffer já deu a volta: a entrada mais antiga está no índice de escrita
+        start = self.count % self.capacity
+        return np.concatenate((array[..., start:], array[..., :start]), axis=-1)
+
+    def ordered_values(self) -> np.ndarray:
+        """
+        Campos reais em ordem cronológica
+
+        Returns:
+            Array (5, N): tempo, fps, confiança média/mín./máx.
+        """
+        return self._ordered(self.values)
+
+    def summarize(self, start: int) -> _WindowStats:
+        """
+        Estatísticas das detecções a partir do índice cronológico start
+
+        Args:
+            start: Primeira detecção considerada (start < len(self))
+
+        Returns:
+            Contagem, soma/máx./mín. do tempo de processamento e do FPS e
+            soma da confiança média
+        """
+        size = len(self)
+        if ring_summarize is not None:
+            oldest = (self.count - size) % self.capacity
+            count, *sums = ring_summarize(self.values, oldest, start, size)
+            return _WindowStats(int(count), *sums)
+
+        recent = self.ordered_values()[:, start:]
+        processing_times = recent[_RING_PROCESSING_TIME]
+        fps_values = recent[_RING_FPS]
+        return _WindowStats(
+            int(recent.shape[1]),
+            float(processing_times.sum()),
+            float(processing_times.max()),
+            float(processing_times.min()),
+            float(fps_values.sum()),
+            float(fps_values.max()),
+            float(fps_values.min()),
+            float(recent[_RING_CONFIDENCE].sum()),
+        )
+
+    def timestamp_at(self, index: int) -> int:
+        """
+        Timestamp monotônico (ns) da detecção no índice cronológico dado
+
+        Args:
+            index: Posição na ordem cronológica (0 = mais antiga mantida)
+
+        Returns:
+            Timestamp em nanossegundos (time.monotonic_ns)
+        """
+        oldest = (self.count - len(self)) % self.capacity
+        return int(self.integers[_RING_TIMESTAMP_NS, (oldest + index) % self.capacity])
+
+    def window_start(self, cutoff_ns: int) -> int:
+        """
+        Primeira detecção (na ordem cronológica) com timestamp >= cutoff_ns
+
+        Os timestamps são monotônicos, então cada trecho do buffer é ordenado:
+        as bordas resolvem os casos "nada" e "tudo" em O(1) e o resto é busca
+        binária, sem montar a visão cronológica.
+
+        Args:
+            cutoff_ns: Início da janela (time.monotonic_ns)
+
+        Returns:
+            Índice cronológico (len(self) se nenhuma detecção estiver na janela)
+        """
+        size = len(self)
+        if not size:
+            return 0
+
+        timestamps = self.integers[_RING_TIMESTAMP_NS]
+        oldest = (self.count - size) % self.capacity
+        newest = (self.count - 1) % self.capacity
+        if timestamps[newest] < cutoff_ns:
+            return size
+        if timestamps[oldest] >= cutoff_ns:
+            return 0
+
+        if self.count <= self.capacity:
+            return int(np.searchsorted(timestamps[:size], cutoff_ns))
+
+        # Buffer já deu a volta: trecho antigo [oldest:] seguido de [:oldest]
+        older = timestamps[oldest:]
+        if older[-1] >= cutoff_ns:
+            return int(np.searchsorted(older, cutoff_ns))
+        return len(older) + int(np.searchsorted(timestamps[:oldest], cutoff_ns))
+
+    def wall_time(self, timestamp_ns: int) -> float:
+        """Converte um timestamp monotônico (ns) para segundos de time.time()"""
+        origin_ns, origin_wall = self.clock_origin
+        return origin_wall + (timestamp_ns - origin_ns) / _NS_PER_SECOND
+
+    def to_metrics(self, start: int = 0) -> List[DetectionMetrics]:
+        """
+        Monta os DetectionMetrics em ordem cronológica
+
+        Args:
+            start: Índice cronológico inicial (ex.: window_start)
+
+        Returns:
+            Lista de DetectionMetrics
+        """
+        values = self.ordered_values()[:, start:]
+        integers = self._ordered(self.integers)[:, start:]
+        positions = self._ordered(np.arange(self.capacity))[start:]
+
+        times, fps_values, averages, minimums, maximums = values.tolist()
+        timestamps, totals, occupied = integers.tolist()
+        extra = [self.additional_data[position] for position in positions.tolist()]
+        return [
+            DetectionMetrics(
+                timestamp=self.wall_time(timestamps[i]),
+                mode=self.mode,
+                processing_time=times[i],
+                fps=fps_values[i],
+                total_slots=totals[i],
+                occupied_slots=occupied[i],
+                free_slots=totals[i] - occupied[i],
+                confidence_avg=averages[i],
+                confidence_min=minimums[i],
+                confidence_max=maximums[i],
+                additional_data=extra[i],
+            )
+            for i in range(len(timestamps))
+        ]
+
+    def latest(self) -> Optional[DetectionMetrics]:
+        """Métricas da detecção mais recente (None se vazio)"""
+        if not self.count:
+            return None
+        index = (self.count - 1) % self.capacity
+        values = self.values[:, index].tolist()
+        timestamp_ns, total, occupied = self.integers[:, index].tolist()
+        return DetectionMetrics(
+            timestamp=self.wall_time(timestamp_ns),
+            mode=self.mode,
+            processing_time=values[_RING_PROCESSING_TIME],
+            fps=values[_RING_FPS],
+            total_slots=total,
+            occupied_slots=occupied,
+            free_slots=total - occupied,
+            confidence_avg=values[_RING_CONFIDENCE],
+            confidence_min=values[_RING_CONFIDENCE_MIN],
+            confidence_max=values[_RING_CONFIDENCE_MAX],
+            additional_data=self.additional_data[index],
+        )
+
+    def __iter__(self):
+        return iter(self.to_metrics())
+
+
+@dataclass(slots=True)
+class _ModeState:
+    """Estado interno de um modo usado a cada frame (um acesso por detecção)"""
+
+    history: _MetricsRing
+    recent_window: deque
+    # Somas (fps, tempo, confiança) da janela recente
+    recent_sums: List[float] = field(default_factory=lambda: [0.0, 0.0, 0.0])
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    # Último timestamp (ns) e média exponencial do intervalo entre frames (s)
+    last_frame_time: Optional[int] = None
+    ema_frame_interval: Optional[float] = None
+
+
 class PerformanceTracker(LoggerMixin):
     """
     Rastreador de performance que monitora e compara
     diferentes modos de detecção em tempo real.
     """
 
+    # Detecções consideradas nas médias recentes de mode_stats
+    RECENT_STATS_WINDOW = 100
+
+    # Peso do intervalo mais recente na média exponencial usada no FPS
+    FPS_EMA_ALPHA = 0.1
+
     def __init__(self, max_history_size: int = 1000, metrics_window_minutes: int = 5):
         """
         Inicializa o rastreador de performance
@@ -71,17 +449,34 @@ class PerformanceTracker(LoggerMixin):
         self.max_history_size = max_history_size
         self.metrics_window = timedelta(minutes=metrics_window_minutes)
 
-        # Armazenamento de métricas por modo
-        self.metrics_history: Dict[str, deque] = defaultdict(
-            lambda: deque(maxlen=max_history_size)
-        )
+        # Armazenamento de métricas por modo (buffer circular de arrays)
+        self.metrics_history: Dict[str, _MetricsRing] = {}
         self.mode_stats: Dict[str, Dict[str, Any]] = defaultdict(dict)
         self.mode_errors: Dict[str, int] = defaultdict(int)
         self.mode_start_times: Dict[str, float] = {}
 
+        # Estado de cada modo resolvido com uma única busca por frame; cada
+        # modo tem seu lock (modos independentes não disputam entre si) e
+        # este protege a criação de um modo novo
+        self._modes: Dict[str, _ModeState] = {}
+        self._modes_lock = threading.Lock()
+
+        # Timestamps internos são time.monotonic_ns(); esta origem converte
+        # para horário real (time.time()) só na saída
+        self._clock_origin = (time.monotonic_ns(), time.time())
+
+        # Resumos já calculados: (modo, minutos) ->
+        # (detecções registradas, erros, válido até em ns, resumo)
+        self._summary_cache: Dict[
+            Tuple[str, float], Tuple[int, int, float, Dict[str, Any]]
+        ] = {}
+
         # Performance em tempo real
         self.current_fps: Dict[str, float] = defaultdict(float)
-        self.frame_times: Dict[str, deque] = defaultdict(lambda: deque(maxlen=30))
+
+        # Kernels do buffer compilados antes do primeiro frame
+        if NUMBA_AVAILABLE:
+            _warmup_metrics_kernel()
 
         self.logger.info("PerformanceTracker inicializado")
 
@@ -92,9 +487,38 @@ class PerformanceTracker(LoggerMixin):
         Args:
             mode: Nome do modo (threshold, yolo, hybrid)
         """
+        self._ensure_mode(mode)
         self.mode_start_times[mode] = time.time()
         self.logger.info(f"Iniciado rastreamento para modo: {mode}")
 
+    def _ensure_mode(self, mode: str) -> _ModeState:
+        """
+        Cria as estruturas de um modo na primeira vez em que ele aparece
+
+        Args:
+            mode: Nome do modo
+
+        Returns:
+            Estado do modo
+        """
+        state = self._modes.get(mode)
+        if state is not None:
+            return state
+
+        with self._modes_lock:
+            state = self._modes.get(mode)
+            if state is None:
+                history = _MetricsRing(
+                    mode, self.max_history_size, self._clock_origin
+                )
+                state = _ModeState(
+                    history, deque(maxlen=self.RECENT_STATS_WINDOW)
+                )
+                self.metrics_history[mode] = history
+                # Publicado por último: quem o vê já encontra o resto pronto
+                self._modes[mode] = state
+        return state
+
     def log_detection_metrics(
         self,
         mode: str,
@@ -111,48 +535,69 @@ class PerformanceTracker(LoggerMixin):
             results: Resultados da detecção
             additional_data: Dados adicionais específicos do modo
         """
-        timestamp = time.time()
-
-        # Calcular FPS
-        self.frame_times[mode].append(timestamp)
-        if len(self.frame_times[mode]) > 1:
-            time_diff = self.frame_times[mode][-1] - self.frame_times[mode][0]
-            fps = len(self.frame_times[mode]) / max(time_diff, 0.001)
-        else:
-            fps = 0.0
-
-        self.current_fps[mode] = fps
-
-        # Calcular estatísticas dos slots
+        # Estatísticas dos slots e de confiança em uma única passada
         total_slots = len(results)
-        occupied_slots = sum(
-            1 for r in results.values() if r.get("status") == "OCCUPIED"
-        )
+        occupied_slots = 0
+        confidence_sum = 0.0
+        confidence_min = float("inf")
+        confidence_max = float("-inf")
+        for r in results.values():
+            if r.get("status") == "OCCUPIED":
+                occupied_slots += 1
+            confidence = r.get("confidence", 0.0)
+            confidence_sum += confidence
+            if confidence < confidence_min:
+                confidence_min = confidence
+            if confidence > confidence_max:
+                confidence_max = confidence
         free_slots = total_slots - occupied_slots
 
-        # Calcular estatísticas de confiança
-        confidences = [r.get("confidence", 0.0) for r in results.values()]
-        confidence_avg = statistics.mean(confidences) if confidences else 0.0
-        confidence_min = min(confidences) if confidences else 0.0
-        confidence_max = max(confidences) if confidences else 0.0
-
-        # Criar objeto de métricas
-        metrics = DetectionMetrics(
-            timestamp=timestamp,
-            mode=mode,
-            processing_time=processing_time,
-            fps=fps,
-            total_slots=total_slots,
-            occupied_slots=occupied_slots,
-            free_slots=free_slots,
-            confidence_avg=confidence_avg,
-            confidence_min=confidence_min,
-            confidence_max=confidence_max,
-            additional_data=additional_data or {},
-        )
+        if total_slots:
+            confidence_avg = confidence_sum / total_slots
+        else:
+            confidence_avg = confidence_min = confidence_max = 0.0
+
+        state = self._modes.get(mode)
+        if state is None:
+            state = self._ensure_mode(mode)
+        history = state.history
+
+        # Estado do modo alterado sob o lock do modo (um produtor por vez)
+        with state.lock:
+            timestamp_ns = time.monotonic_ns()
+
+            # Calcular FPS (média exponencial do intervalo entre frames)
+            previous = state.last_frame_time
+            state.last_frame_time = timestamp_ns
+            if previous is not None:
+                interval = (timestamp_ns - previous) / _NS_PER_SECOND
+                ema = state.ema_frame_interval
+                if ema is None:
+                    ema = interval
+                ema += self.FPS_EMA_ALPHA * (interval - ema)
+                state.ema_frame_interval = ema
+                fps = 1.0 / max(ema, 1e-6)
+            else:
+                fps = 0.0
+
+            self.current_fps[mode] = fps
+
+            # Armazenar no histórico
+            history.push(
+                timestamp_ns,
+                processing_time,
+                fps,
+                total_slots,
+                occupied_slots,
+                confidence_avg,
+                confidence_min,
+                confidence_max,
+                additional_data,
+            )
 
-        # Armazenar no histórico
-        self.metrics_history[mode].append(metrics)
+            # Atualizar estatísticas do modo
+            self._push_recent(state, fps, processing_time, confidence_avg)
+            self._update_mode_stats(mode, state)
 
         # Log estruturado para análise posterior
         self.smartpark_logger.log_detection_metrics(
@@ -165,9 +610,6 @@ class PerformanceTracker(LoggerMixin):
             free_slots=free_slots,
         )
 
-        # Atualizar estatísticas do modo
-        self._update_mode_stats(mode)
-
     def log_error(self, mode: str, error_type: str, error_message: str):
         """
         Registra um erro para um modo específico
@@ -177,7 +619,9 @@ class PerformanceTracker(LoggerMixin):
             error_type: Tipo do erro
             error_message: Mensagem do erro
         """
-        self.mode_errors[mode] += 1
+        state = self._modes.get(mode)
+        with state.lock if state is not None else self._modes_lock:
+            self.mode_errors[mode] += 1
         self.logger.error(f"Erro no modo {mode} ({error_type}): {error_message}")
 
     def get_current_metrics(self, mode: str) -> Optional[DetectionMetrics]:
@@ -190,10 +634,11 @@ class PerformanceTracker(LoggerMixin):
         Returns:
             Métricas mais recentes ou None se não houver
         """
-        if mode not in self.metrics_history or not self.metrics_history[mode]:
+        history = self.metrics_history.get(mode)
+        if history is None:
             return None
 
-        return self.metrics_history[mode][-1]
+        return history.read(history.latest)
 
     def get_mode_summary(self, mode: str, minutes: int = 5) -> Dict[str, Any]:
         """
@@ -206,38 +651,68 @@ class PerformanceTracker(LoggerMixin):
         Returns:
             Dicionário com estatísticas resumidas
         """
-        if mode not in self.metrics_history:
+        history = self.metrics_history.get(mode)
+        if history is None:
             return {}
 
-        # Filtrar métricas da janela de tempo
-        cutoff_time = time.time() - (minutes * 60)
-        recent_metrics = [
-            m for m in self.metrics_history[mode] if m.timestamp >= cutoff_time
-        ]
+        # Reaproveitar o resumo enquanto não houver nova detecção nem erro e
+        # nenhuma métrica tiver saído da janela de tempo
+        now_ns = time.monotonic_ns()
+        count = history.count
+        errors = self.mode_errors.get(mode, 0)
+        cached = self._summary_cache.get((mode, minutes))
+        if (
+            cached is not None
+            and cached[0] == count
+            and cached[1] == errors
+            and now_ns <= cached[2]
+        ):
+            return dict(cached[3])
+
+        window_ns = round(minutes * 60 * _NS_PER_SECOND)
+
+        def read_window():
+            """
+            Reduz a janela de tempo do buffer a (detecções registradas,
+            estatísticas, timestamp da mais antiga na janela)
+            """
+            start = history.window_start(now_ns - window_ns)
+            if start == len(history):
+                return history.count, None, 0
+
+            return (
+                history.count,
+                history.summarize(start),
+                history.timestamp_at(start),
+            )
 
-        if not recent_metrics:
-            return {}
+        # Filtrar métricas da janela de tempo (leitura sem bloquear o produtor)
+        count, stats, oldest_ns = history.read(read_window)
 
-        # Calcular estatísticas
-        processing_times = [m.processing_time for m in recent_metrics]
-        fps_values = [m.fps for m in recent_metrics]
-        confidences = [m.confidence_avg for m in recent_metrics]
+        if stats is None:
+            self._summary_cache[(mode, minutes)] = (count, errors, math.inf, {})
+            return {}
 
-        return {
+        summary = {
             "mode": mode,
             "period_minutes": minutes,
-            "total_detections": len(recent_metrics),
-            "avg_processing_time": statistics.mean(processing_times),
-            "max_processing_time": max(processing_times),
-            "min_processing_time": min(processing_times),
-            "avg_fps": statistics.mean(fps_values),
-            "max_fps": max(fps_values),
-            "min_fps": min(fps_values),
-            "avg_confidence": statistics.mean(confidences),
-            "error_count": self.mode_errors.get(mode, 0),
+            "total_detections": stats.count,
+            "avg_processing_time": stats.time_sum / stats.count,
+            "max_processing_time": stats.time_max,
+            "min_processing_time": stats.time_min,
+            "avg_fps": stats.fps_sum / stats.count,
+            "max_fps": stats.fps_max,
+            "min_fps": stats.fps_min,
+            "avg_confidence": stats.confidence_sum / stats.count,
+            "error_count": errors,
             "current_fps": self.current_fps.get(mode, 0.0),
         }
 
+        # A métrica mais antiga da janela sai dela após minutes * 60 segundos
+        valid_until = oldest_ns + window_ns
+        self._summary_cache[(mode, minutes)] = (count, errors, valid_until, summary)
+        return dict(summary)
+
     def compare_modes(self, minutes: int = 5) -> List[ModeComparison]:
         """
         Compara performance entre todos os modos
@@ -250,7 +725,7 @@ class PerformanceTracker(LoggerMixin):
         """
         comparisons = []
 
-        for mode in self.metrics_history.keys():
+        for mode in list(self.metrics_history):
             summary = self.get_mode_summary(mode, minutes)
             if not summary:
                 continue
@@ -292,48 +767,63 @@ class PerformanceTracker(LoggerMixin):
         Returns:
             Nome do melhor modo ou None
         """
-        comparisons = self.compare_modes()
-        if not comparisons:
+        # Só os resumos (em cache) importam: sem montar os ModeComparison
+        summaries = []
+        for mode in list(self.metrics_history):
+            summary = self.get_mode_summary(mode)
+            if summary:
+                summaries.append((mode, summary))
+        if not summaries:
             return None
 
+        # Mesma ordem do compare_modes (desempate pelo FPS)
+        summaries.sort(key=lambda item: item[1]["avg_fps"], reverse=True)
+
         if criteria == "fps":
-            return max(comparisons, key=lambda x: x.avg_fps).mode
+            return summaries[0][0]
         elif criteria == "accuracy":
-            return max(comparisons, key=lambda x: x.avg_accuracy).mode
+            return max(summaries, key=lambda item: item[1]["avg_confidence"])[0]
         elif criteria == "processing_time":
-            return min(comparisons, key=lambda x: x.avg_processing_time).mode
+            return min(summaries, key=lambda item: item[1]["avg_processing_time"])[0]
         else:
-            return comparisons[0].mode
+            return summaries[0][0]
 
     def export_metrics(self, filepath: str, mode: str = None, hours: int = 1):
         """
         Exporta métricas para arquivo JSON
 
+        Com extensão .ndjson/.jsonl o arquivo é escrito linha a linha: a
+        primeira linha tem o cabeçalho (período, resumos e erros por modo) e
+        cada linha seguinte uma detecção.
+
         Args:
             filepath: Caminho do arquivo
             mode: Modo específico (None para todos)
             hours: Janela de tempo em horas
         """
-        cutoff_time = time.time() - (hours * 3600)
+        cutoff_ns = time.monotonic_ns() - round(hours * 3600 * _NS_PER_SECOND)
         export_data = {
             "export_timestamp": datetime.now().isoformat(),
             "period_hours": hours,
             "modes": {},
         }
 
-        modes_to_export = [mode] if mode else self.metrics_history.keys()
+        modes_to_export = [mode] if mode else list(self.metrics_history)
 
         for mode_name in modes_to_export:
-            if mode_name not in self.metrics_history:
+            # Modos iniciados mas ainda sem detecções ficam de fora
+            history = self.metrics_history.get(mode_name)
+            if not history:
                 continue
 
-            # Filtrar métricas
-            mode_metrics = [
-                m for m in self.metrics_history[mode_name] if m.timestamp >= cutoff_time
-            ]
+            # Filtrar métricas (montadas só para a exportação)
+            mode_metrics = history.read(
+                lambda: history.to_metrics(history.window_start(cutoff_ns))
+            )
 
+            # DetectionMetrics convertidas pelo encoder (via _json_default)
             export_data["modes"][mode_name] = {
-                "metrics": [m.to_dict() for m in mode_metrics],
+                "metrics": mode_metrics,
                 "summary": self.get_mode_summary(mode_name, hours * 60),
                 "error_count": self.mode_errors.get(mode_name, 0),
             }
@@ -342,31 +832,114 @@ class PerformanceTracker(LoggerMixin):
         filepath = Path(filepath)
         filepath.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        if filepath.suffix.lower() in _NDJSON_SUFFIXES:
+            self._write_ndjson(filepath, export_data)
+            self.logger.info(f"Métricas exportadas para: {filepath}")
+            return
+
+        encoded = None
+        if ORJSON_AVAILABLE:
+            try:
+                encoded = orjson.dumps(
+                    export_data,
+                    default=_json_default,
+                    option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2,
+                )
+            except TypeError:
+                # Dados adicionais com tipos que o orjson não serializa
+                encoded = None
+
+        if encoded is not None:
+            filepath.write_bytes(encoded)
+        else:
+            with open(filepath, "w", encoding="utf-8") as f:
+                json.dump(
+                    export_data,
+                    f,
+                    indent=2,
+                    ensure_ascii=False,
+                    default=_json_default,
+                )
 
         self.logger.info(f"Métricas exportadas para: {filepath}")
 
-    def _update_mode_stats(self, mode: str):
-        """Atualiza estatísticas internas do modo"""
-        if mode not in self.metrics_history or not self.metrics_history[mode]:
-            return
+    @staticmethod
+    def _write_ndjson(filepath: Path, export_data: Dict[str, Any]):
+        """
+        Grava a exportação como JSON delimitado por linhas, sem indentação
+
+        Args:
+            filepath: Caminho do arquivo
+            export_data: Dados montados por export_metrics
+        """
+        modes = export_data["modes"]
+        header = {
+            "export_timestamp": export_data["export_timestamp"],
+            "period_hours": export_data["period_hours"],
+            "modes": {
+                name: {
+                    "summary": data["summary"],
+                    "error_count": data["error_count"],
+                    "total_metrics": len(data["metrics"]),
+                }
+                for name, data in modes.items()
+            },
+        }
 
-        recent_metrics = list(self.metrics_history[mode])[
-            -100:
-        ]  # Últimas 100 detecções
+        with open(filepath, "wb") as f:
+            f.write(_json_line(header))
+            for data in modes.values():
+                for metric in data["metrics"]:
+                    f.write(_json_line(metric))
 
-        if recent_metrics:
+    def _push_recent(
+        self,
+        state: _ModeState,
+        fps: float,
+        processing_time: float,
+        confidence: float,
+    ):
+        """
+        Insere uma detecção na janela recente do modo em O(1)
+
+        Args:
+            state: Estado do modo
+            fps: FPS da detecção
+            processing_time: Tempo de processamento
+            confidence: Confiança média da detecção
+        """
+        window = state.recent_window
+        sums = state.recent_sums
+
+        # Janela cheia: a entrada mais antiga sai das somas
+        if len(window) == window.maxlen:
+            old_fps, old_time, old_confidence = window[0]
+            sums[0] -= old_fps
+            sums[1] -= old_time
+            sums[2] -= old_confidence
+
+        window.append((fps, processing_time, confidence))
+        sums[0] += fps
+        sums[1] += processing_time
+        sums[2] += confidence
+
+        # Ressincroniza as somas a cada volta completa da janela para não
+        # acumular erro de arredondamento
+        if state.history.count % self.RECENT_STATS_WINDOW == 0:
+            sums[:] = [math.fsum(column) for column in zip(*window)]
+
+    def _update_mode_stats(self, mode: str, state: _ModeState):
+        """Atualiza estatísticas internas do modo"""
+        # Últimas 100 detecções (somas mantidas por _push_recent)
+        count = len(state.recent_window)
+        if count:
+            sum_fps, sum_time, sum_confidence = state.recent_sums
             self.mode_stats[mode] = {
                 "last_update": time.time(),
-                "total_detections": len(self.metrics_history[mode]),
-                "recent_avg_fps": statistics.mean([m.fps for m in recent_metrics]),
-                "recent_avg_processing_time": statistics.mean(
-                    [m.processing_time for m in recent_metrics]
-                ),
-                "recent_avg_confidence": statistics.mean(
-                    [m.confidence_avg for m in recent_metrics]
-                ),
+                "total_detections": len(state.history),
+                "recent_avg_fps": sum_fps / count,
+                "recent_avg_processing_time": sum_time / count,
+                "recent_avg_confidence": sum_confidence / count,
             }
 
     def get_real_time_stats(self) -> Dict[str, Any]: